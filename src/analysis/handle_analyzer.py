@@ -1,16 +1,51 @@
 import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import pandas as pd
 import argparse
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import logging
 from dotenv import load_dotenv
 from ..backtesting.backtest import Backtester
-from ..config.settings import settings
+from ..trading.historical_data import HistoricalDataFetcher
 from ..config.validator import ConfigValidator
 
 logger = logging.getLogger(__name__)
 
+# Fetcher shared by every backtest run in a worker process
+_worker_historical_data: Optional[HistoricalDataFetcher] = None
+
+def _init_worker(historical_data: HistoricalDataFetcher, threads: int):
+    """Install the shared historical data fetcher in a worker process"""
+    global _worker_historical_data
+    _worker_historical_data = historical_data
+    # Every worker runs its own sentiment model; split the cores between them
+    # rather than letting each one start a thread per core. torch reads this when
+    # first imported and SentimentAnalyzer passes it to ONNX Runtime.
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        # Inherited already imported through fork, too late for the variable
+        torch.set_num_threads(threads)
+
+def _run_one_handle(handle: str, start_date: str, end_date: str) -> Tuple[str, Dict, Dict, List[str]]:
+    """Backtest a single handle; runs in a worker process"""
+    logger.info(f"\nAnalyzing handle: {handle}")
+    logger.debug("Creating backtester for %s", handle)
+    backtester = Backtester(start_date, end_date, historical_data=_worker_historical_data)
+    
+    logger.info(f"Running backtest for {handle}")
+    backtester.run_backtest(handle)
+    
+    return (
+        handle,
+        backtester.performance_metrics,
+        backtester.symbol_metrics,
+        list(backtester.symbols_traded)
+    )
+
 class HandleAnalyzer:
     def __init__(self, handles: List[str], start_date: str, end_date: str):
         logger.info(f"Initializing HandleAnalyzer with dates: {start_date} to {end_date}")
@@ -32,31 +67,48 @@ class HandleAnalyzer:
         self.end_date = end_date
         self.results: Dict[str, Dict] = {}
         
+        # One fetcher (and its caches) shared by all handle backtests
+        self.historical_data = HistoricalDataFetcher(
+            api_key=os.getenv('KITE_API_KEY'),
+            api_secret=os.getenv('KITE_API_SECRET')
+        )
+        
     def analyze_handles(self):
         """Run backtests for all handles"""
         logger.info("Starting handle analysis")
         
-        for handle in self.handles:
-            logger.info(f"\nAnalyzing handle: {handle}")
-            try:
-                logger.debug(f"Creating backtester for {handle}")
-                backtester = Backtester(self.start_date, self.end_date)
-                
-                logger.info(f"Running backtest for {handle}")
-                backtester.run_backtest(handle)
-                
-                logger.debug(f"Storing results for {handle}")
-                self.results[handle] = {
-                    'performance_metrics': backtester.performance_metrics,
-                    'symbol_metrics': backtester.symbol_metrics,
-                    'symbols_traded': list(backtester.symbols_traded)
-                }
-                
-                logger.info(f"Successfully analyzed {handle}")
-                logger.debug(f"Results for {handle}: {self.results[handle]}")
-                
-            except Exception as e:
-                logger.error(f"Error analyzing handle {handle}: {str(e)}", exc_info=True)
+        if not self.handles:
+            logger.warning("No handles to analyze")
+            return
+
+        max_workers = min(len(self.handles), os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self.historical_data, max(1, (os.cpu_count() or 1) // max_workers))
+        ) as executor:
+            futures = {
+                executor.submit(_run_one_handle, handle, self.start_date, self.end_date): handle
+                for handle in self.handles
+            }
+            
+            for future in as_completed(futures):
+                handle = futures[future]
+                try:
+                    _, performance_metrics, symbol_metrics, symbols_traded = future.result()
+                    
+                    logger.debug("Storing results for %s", handle)
+                    self.results[handle] = {
+                        'performance_metrics': performance_metrics,
+                        'symbol_metrics': symbol_metrics,
+                        'symbols_traded': symbols_traded
+                    }
+                    
+                    logger.info(f"Successfully analyzed {handle}")
+                    logger.debug("Results for %s: %s", handle, self.results[handle])
+                    
+                except Exception as e:
+                    logger.error(f"Error analyzing handle {handle}: {str(e)}", exc_info=True)
     
     def generate_rankings(self) -> pd.DataFrame:
         """Generate rankings based on different metrics"""
@@ -66,34 +118,69 @@ class HandleAnalyzer:
             logger.warning("No results available for ranking")
             return pd.DataFrame()
             
-        rankings_data = []
+        columns = defaultdict(list)
         for handle, data in self.results.items():
-            logger.debug(f"Processing rankings for {handle}")
+            logger.debug("Processing rankings for %s", handle)
             metrics = data['performance_metrics']
-            rankings_data.append({
-                'handle': handle,
-                'total_pnl': metrics.get('total_pnl', 0),
-                'win_rate': metrics.get('win_rate', 0),
-                'sharpe_ratio': metrics.get('sharpe_ratio', 0),
-                'profit_factor': metrics.get('profit_factor', 0),
-                'max_drawdown': metrics.get('max_drawdown', 0),
-                'total_trades': metrics.get('total_trades', 0),
-                'symbols_traded': len(data['symbols_traded']),
-                'avg_profit_per_trade': metrics.get('total_pnl', 0) / metrics.get('total_trades', 1)
-            })
+            columns['handle'].append(handle)
+            columns['total_pnl'].append(metrics.get('total_pnl', 0))
+            columns['win_rate'].append(metrics.get('win_rate', 0))
+            columns['sharpe_ratio'].append(metrics.get('sharpe_ratio', 0))
+            columns['profit_factor'].append(metrics.get('profit_factor', 0))
+            columns['max_drawdown'].append(metrics.get('max_drawdown', 0))
+            columns['total_trades'].append(metrics.get('total_trades', 0))
+            columns['symbols_traded'].append(len(data['symbols_traded']))
             
-        df = pd.DataFrame(rankings_data)
+        df = pd.DataFrame(columns)
+        df['avg_profit_per_trade'] = df['total_pnl'] / df['total_trades'].replace(0, 1)
         
         # Calculate composite score
-        df['score'] = (
-            df['sharpe_ratio'].rank() +
-            df['profit_factor'].rank() +
-            df['win_rate'].rank() -
-            abs(df['max_drawdown']).rank()
-        ) / 4
+        ranks = df[['sharpe_ratio', 'profit_factor', 'win_rate']].rank()
+        drawdown_rank = df['max_drawdown'].abs().rank()
+        df['score'] = (ranks.sum(axis=1) - drawdown_rank) / 4
         
         return df.sort_values('score', ascending=False)
 
+    def generate_report(self) -> str:
+        """Generate a text report of handle rankings and their top symbols"""
+        rankings = self.generate_rankings()
+        if rankings.empty:
+            return "No analysis results available."
+
+        # Top 3 symbols per handle from one long frame, sorted once
+        top_symbols = defaultdict(list)
+        symbol_frames = {
+            handle: pd.DataFrame.from_dict(data['symbol_metrics'], orient='index')
+            for handle, data in self.results.items() if data['symbol_metrics']
+        }
+        if symbol_frames:
+            all_symbols = pd.concat(symbol_frames, names=['handle', 'symbol']).reset_index()
+            top3 = (
+                all_symbols
+                .sort_values(['handle', 'total_pnl'], ascending=[True, False])
+                .groupby('handle')
+                .head(3)
+            )
+            for row in top3.itertuples(index=False):
+                top_symbols[row.handle].append(
+                    f"    {row.symbol}: ₹{row.total_pnl:,.2f} over {row.total_trades} trades"
+                )
+
+        report = []
+        report.append("=== Handle Analysis Report ===")
+        
+        for row in rankings.itertuples(index=False):
+            report.append(f"\n{row.handle} (score {row.score:.2f}):")
+            report.append(f"  Total Trades: {row.total_trades}")
+            report.append(f"  Win Rate: {row.win_rate:.2%}")
+            report.append(f"  Total P&L: ₹{row.total_pnl:,.2f}")
+            report.append(f"  Sharpe Ratio: {row.sharpe_ratio:.2f}")
+            if top_symbols[row.handle]:
+                report.append("  Top Symbols:")
+                report.extend(top_symbols[row.handle])
+        
+        return "\n".join(report)
+
 def main():
     parser = argparse.ArgumentParser(description='Analyze multiple Twitter handles for trading performance')
     parser.add_argument('--handles', nargs='+', required=True, help='List of Twitter handles to analyze')
@@ -132,6 +219,8 @@ def main():
         rankings = analyzer.generate_rankings()
         print("\nAnalysis Results:")
         print(rankings)
+        print()
+        print(analyzer.generate_report())
         
         # Save results if output file specified
         if args.output:
@@ -1,22 +1,26 @@
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, List, Union
 from ..models.trade import Trade
+from ..models.trade_store import TradeStore
 
 class HandlePerformance:
     def __init__(self):
         self.handle_metrics: Dict[str, Dict] = {}
 
-    def calculate_handle_metrics(self, handle: str, trades: List[Trade]):
+    def calculate_handle_metrics(self, handle: str, trades: Union[TradeStore, List[Trade]]):
         """Calculate performance metrics for a specific handle"""
-        if not trades:
+        if not isinstance(trades, TradeStore):
+            trades = TradeStore.from_trades(trades)
+        if not len(trades):
             return
 
         # Calculate metrics
-        total_trades = len(trades)
-        profitable_trades = len([t for t in trades if t.pnl > 0])
-        win_rate = profitable_trades / total_trades if total_trades > 0 else 0
-        total_pnl = sum(t.pnl for t in trades)
-        avg_return = total_pnl / total_trades if total_trades > 0 else 0
+        pnl = trades.pnl
+        total_trades = len(pnl)
+        profitable_trades = int((pnl > 0).sum())
+        win_rate = profitable_trades / total_trades
+        total_pnl = float(pnl.sum())
+        avg_return = total_pnl / total_trades
 
         self.handle_metrics[handle] = {
             'total_trades': total_trades,
@@ -0,0 +1,54 @@
+import numpy as np
+from ._njit import njit
+
+
+@njit(cache=True)
+def _simulate_trade_kernel(
+    open_arr,
+    high_arr,
+    low_arr,
+    close_arr,
+    ts_arr,
+    entry_ts_ns,
+    trade_amount,
+    sl_pct,
+    tg_pct
+):
+    """
+    Simulate a single long trade over contiguous OHLC arrays
+
+    Enters at the open of the first bar strictly after ``entry_ts_ns`` and
+    exits on the first bar that hits the stop loss or target (stop loss wins
+    ties), or at the last close if neither is hit.
+
+    Returns:
+        Tuple of (entry_i, exit_i, entry_price, exit_price, qty, pnl).
+        entry_i is -1 when no trade can be placed.
+    """
+    n = len(ts_arr)
+    entry_i = np.searchsorted(ts_arr, entry_ts_ns, side='right')
+    if entry_i >= n - 1:
+        return -1, -1, 0.0, 0.0, 0, 0.0
+
+    entry_price = open_arr[entry_i]
+    qty = int(trade_amount / entry_price)
+    if qty <= 0:
+        return -1, -1, 0.0, 0.0, 0, 0.0
+
+    stop_loss = entry_price * (1 - sl_pct / 100)
+    target = entry_price * (1 + tg_pct / 100)
+
+    exit_i = n - 1
+    exit_price = close_arr[n - 1]
+    for i in range(entry_i + 1, n):
+        if low_arr[i] <= stop_loss:
+            exit_i = i
+            exit_price = stop_loss
+            break
+        elif high_arr[i] >= target:
+            exit_i = i
+            exit_price = target
+            break
+
+    pnl = (exit_price - entry_price) * qty
+    return entry_i, exit_i, entry_price, exit_price, qty, pnl
@@ -0,0 +1,17 @@
+"""Optional Numba support.
+
+Falls back to a no-op ``njit`` decorator when Numba is not installed, so the
+kernels still run (as plain Python) everywhere.
+"""
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on the environment
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit``"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
@@ -1,18 +1,40 @@
 import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import math
 import numpy as np
-from typing import List, Dict, Optional, Set
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Set, Tuple
+from datetime import datetime
+from dotenv import load_dotenv
 from ..models.tweet import Tweet
 from ..models.trade import Trade
+from ..models.trade_store import TradeStore, ist_hour
 from ..sentiment.analyzer import SentimentAnalyzer
 from ..twitter.stream import TwitterStream
-from ..twitter.symbol_extractor import SymbolExtractor
-from ..trading.historical_data import HistoricalDataFetcher
-from ..config.settings import settings
+from ..twitter.symbol_extractor import SymbolExtractor, SymbolScore
+from ..trading.historical_data import HistoricalDataFetcher, OHLCV
+from ..config.settings import get_settings
+from ._kernels import _simulate_trade_kernel
+
+logger = logging.getLogger(__name__)
+
+IST = 'Asia/Kolkata'
+NS_PER_DAY = 86_400_000_000_000
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+MAX_FETCH_WORKERS = 8
+
+def _date_to_ns(date_str: str) -> int:
+    """Parse a YYYY-MM-DD date into int64 nanoseconds since the epoch"""
+    return int(np.datetime64(date_str).astype('datetime64[ns]').view('i8'))
 
 class Backtester:
-    def __init__(self, start_date: str, end_date: str):
+    def __init__(
+        self,
+        start_date: str,
+        end_date: str,
+        historical_data: Optional[HistoricalDataFetcher] = None
+    ):
         logger.info("Initializing Backtester")
         
         # Load environment variables
@@ -22,11 +44,13 @@ class Backtester:
         logger.debug("Checking environment variables:")
         logger.debug(f"TWITTER_BEARER_TOKEN present: {bool(os.getenv('TWITTER_BEARER_TOKEN'))}")
         
-        # Initialize components
-        self.historical_data = HistoricalDataFetcher(
-            api_key=os.getenv('KITE_API_KEY'),
-            api_secret=os.getenv('KITE_API_SECRET')
-        )
+        # Initialize components; the fetcher may be shared across backtesters
+        if historical_data is None:
+            historical_data = HistoricalDataFetcher(
+                api_key=os.getenv('KITE_API_KEY'),
+                api_secret=os.getenv('KITE_API_SECRET')
+            )
+        self.historical_data = historical_data
         
         self.symbol_extractor = SymbolExtractor(self.historical_data)
         self.analyzer = SentimentAnalyzer()
@@ -38,9 +62,30 @@ class Backtester:
             bearer_token=os.getenv('TWITTER_BEARER_TOKEN')
         )
         
-        self.start_date = datetime.strptime(start_date, '%Y-%m-%d')
-        self.end_date = datetime.strptime(end_date, '%Y-%m-%d')
+        self.start_ns = _date_to_ns(start_date)
+        self.end_ns = _date_to_ns(end_date)
         self.trades: List[Trade] = []
+        self.trade_store = TradeStore()
+        self._symbol_to_id: Dict[str, int] = {}
+        self._id_to_symbol: List[str] = []
+        
+        # Running performance aggregates, updated as each trade closes
+        self._n = 0
+        self._wins = 0
+        self._sum_pnl = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._gross_profit = 0.0
+        self._gross_loss = 0.0
+        self._equity = 0.0
+        self._peak = 0.0
+        self._max_drawdown = 0.0
+        self._open_n = 0
+        self._open_wins = 0
+        self._open_pnl = 0.0
+        self._close_n = 0
+        self._close_wins = 0
+        self._close_pnl = 0.0
         self.symbols_traded: Set[str] = set()
         self.performance_metrics: Dict = {}
         self.symbol_metrics: Dict[str, Dict] = {}
@@ -48,32 +93,52 @@ class Backtester:
     def process_tweet(
         self, 
         tweet: Tweet, 
-        price_data: Dict[str, pd.DataFrame]
+        price_data: Dict[str, OHLCV],
+        trade_amount: float,
+        sl_pct: float,
+        tg_pct: float,
+        symbol_info: Optional[Tuple[SymbolScore, ...]] = None
     ) -> List[Trade]:
-        """Process a single tweet for backtesting"""
+        """
+        Process a single tweet for backtesting
+
+        symbol_info can be passed in when the caller has already run
+        symbol extraction on the tweet.
+        """
         trades = []
         
-        # Analyze sentiment
-        tweet.sentiment = self.analyzer.analyze(tweet)
+        # Extract symbols with confidence
+        if symbol_info is None:
+            symbol_info = self.symbol_extractor.analyze_symbols(tweet.text)
+        
+        # Cheap filter first: trade only high-confidence symbols with price data
+        tradable = [
+            info.symbol for info in symbol_info
+            if info.confidence >= 0.7 and info.symbol in price_data
+        ]
+        if not tradable:
+            return trades
+        
+        # Analyze sentiment unless already filled in by a batch run
+        if tweet.sentiment is None:
+            tweet.sentiment = self.analyzer.analyze(tweet)
         
         # Only proceed if sentiment is super positive
         if tweet.sentiment != 'SUPER_POSITIVE':
             return trades
-            
-        # Extract symbols with confidence
-        symbol_info = self.symbol_extractor.analyze_symbols(tweet.text)
-        
-        # Trade only high-confidence symbols
-        for info in symbol_info:
-            if info['confidence'] >= 0.7 and info['symbol'] in price_data:
-                trade = self.simulate_trade(
-                    info['symbol'],
-                    tweet,
-                    price_data[info['symbol']]
-                )
-                if trade:
-                    trades.append(trade)
-                    self.symbols_traded.add(info['symbol'])
+        
+        for symbol in tradable:
+            trade = self.simulate_trade(
+                symbol,
+                tweet,
+                price_data[symbol],
+                trade_amount,
+                sl_pct,
+                tg_pct
+            )
+            if trade:
+                trades.append(trade)
+                self.symbols_traded.add(symbol)
         
         return trades
 
@@ -81,60 +146,39 @@ class Backtester:
         self, 
         symbol: str, 
         tweet: Tweet, 
-        price_data: pd.DataFrame
+        price_data: OHLCV,
+        trade_amount: float,
+        sl_pct: float,
+        tg_pct: float
     ) -> Optional[Trade]:
         """Simulate a trade based on tweet sentiment and historical prices"""
-        if price_data.empty:
+        if len(price_data.ts) == 0:
             return None
 
-        tweet_time = tweet.created_at
-        
-        # Find entry price (first price after tweet)
-        entry_data = price_data[price_data.index > tweet_time]
-        if entry_data.empty:
-            return None
-            
-        entry_price = entry_data.iloc[0]['open']
-        entry_time = entry_data.index[0]
-
-        # Calculate position size
-        quantity = int(settings.TRADE_AMOUNT / entry_price)
-        if quantity <= 0:
+        entry_i, exit_i, entry_price, exit_price, quantity, pnl = _simulate_trade_kernel(
+            price_data.open,
+            price_data.high,
+            price_data.low,
+            price_data.close,
+            price_data.ts,
+            pd.Timestamp(tweet.created_at).value,
+            trade_amount,
+            sl_pct,
+            tg_pct
+        )
+        if entry_i < 0:
             return None
 
-        # Find exit price based on stop loss and target
-        stop_loss = entry_price * (1 - settings.STOP_LOSS_PERCENTAGE / 100)
-        target = entry_price * (1 + settings.TARGET_PERCENTAGE / 100)
-        
-        exit_data = price_data[price_data.index > entry_time]
-        exit_price = None
-        exit_time = None
-        
-        for idx, row in exit_data.iterrows():
-            if row['low'] <= stop_loss:
-                exit_price = stop_loss
-                exit_time = idx
-                break
-            elif row['high'] >= target:
-                exit_price = target
-                exit_time = idx
-                break
-
-        # If no stop loss or target hit, use last price
-        if exit_price is None:
-            exit_price = exit_data.iloc[-1]['close']
-            exit_time = exit_data.index[-1]
-
-        # Calculate P&L
-        pnl = (exit_price - entry_price) * quantity
+        entry_ts_ns = int(price_data.ts[entry_i])
+        self._record_trade(symbol, pnl, entry_ts_ns)
 
         return Trade(
             symbol=symbol,
             entry_price=entry_price,
             exit_price=exit_price,
             quantity=quantity,
-            entry_time=entry_time,
-            exit_time=exit_time,
+            entry_time=pd.Timestamp(entry_ts_ns, tz='UTC').tz_convert(IST),
+            exit_time=pd.Timestamp(price_data.ts[exit_i], tz='UTC').tz_convert(IST),
             tweet_id=tweet.id,
             handle=tweet.author,
             sentiment=tweet.sentiment,
@@ -146,70 +190,193 @@ class Backtester:
         """Run backtest for a specific handle"""
         print(f"Running backtest for {handle}")
         
-        current_date = self.start_date
-        tweets_processed = 0
+        # Bind settings once; they are read for every tweet and trade
+        settings = get_settings()
+        trade_amount = settings.TRADE_AMOUNT
+        sl_pct = settings.STOP_LOSS_PERCENTAGE
+        tg_pct = settings.TARGET_PERCENTAGE
+        daily_limit = settings.TWEETS_PER_DAY_LIMIT
+        window = settings.MARKET_OPENING_WINDOW
         
-        while current_date <= self.end_date:
-            print(f"Processing date: {current_date.date()}")
+        # Symbol fetches are I/O-bound API calls, so overlap them on threads
+        with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as fetch_pool:
+            for current_ns in range(self.start_ns, self.end_ns + NS_PER_DAY, NS_PER_DAY):
+                # Only the fetcher API needs a datetime, built once per day
+                current_date = datetime.fromordinal(EPOCH_ORDINAL + current_ns // NS_PER_DAY)
+                print(f"Processing date: {current_date.date()}")
+                day_buffer: List[Tuple[Tweet, Tuple[SymbolScore, ...], List[str]]] = []
             
-            def tweet_callback(tweet: Tweet):
-                nonlocal tweets_processed
-                if tweets_processed >= settings.TWEETS_PER_DAY_LIMIT:
-                    return
-                
-                # Get symbols from tweet
-                symbol_info = self.symbol_extractor.analyze_symbols(tweet.text)
-                symbols = [info['symbol'] for info in symbol_info if info['confidence'] >= 0.7]
+                def tweet_callback(ids, texts, times, authors):
+                    # Tweets arrive as columns; scan all texts for symbols in one batch,
+                    # and only those with a symbol become Tweet objects
+                    infos = self.symbol_extractor.analyze_symbols_batch(texts)
+                    for tweet_id, text, created_at, author, symbol_info in zip(ids, texts, times, authors, infos):
+                        if len(day_buffer) >= daily_limit:
+                            return
+
+                        # Get symbols from tweet
+                        symbols = [info.symbol for info in symbol_info if info.confidence >= 0.7]
+
+                        if not symbols:
+                            continue
+
+                        tweet = Tweet(id=tweet_id, text=text, author=author, created_at=created_at)
+                        day_buffer.append((tweet, symbol_info, symbols))
+                tweet_callback.batch = True
+
+                # Get tweets for the day
+                self.twitter_stream.start_stream(
+                    handles=[handle],
+                    callback=tweet_callback,
+                    is_backtest=True
+                )
+
+                # Build the day's market data once per unique symbol
+                daily_market_data = self._fetch_market_data(
+                    {symbol for _, _, symbols in day_buffer for symbol in symbols},
+                    current_date,
+                    window,
+                    fetch_pool
+                )
+            
+                # Only tweets with a tradable symbol are worth sentiment inference
+                candidates = []
+                for tweet, symbol_info, symbols in day_buffer:
+                    market_data = {
+                        symbol: daily_market_data[symbol]
+                        for symbol in symbols if symbol in daily_market_data
+                    }
+                    if market_data:
+                        candidates.append((tweet, symbol_info, market_data))
+            
+                # Analyze the remaining tweets' sentiment in one batch
+                sentiments = self.analyzer.analyze_batch([tweet for tweet, _, _ in candidates])
+            
+                for (tweet, symbol_info, market_data), sentiment in zip(candidates, sentiments):
+                    tweet.sentiment = sentiment
                 
-                if not symbols:
-                    return
-                    
-                # Get market data for all symbols
-                market_data = {}
-                for symbol in symbols:
-                    data = self.historical_data.get_opening_closing_data(
-                        symbol,
-                        current_date,
-                        window_minutes=settings.MARKET_OPENING_WINDOW
+                    # Process trades
+                    new_trades = self.process_tweet(
+                        tweet, market_data, trade_amount, sl_pct, tg_pct, symbol_info=symbol_info
                     )
-                    if not data['opening'].empty or not data['closing'].empty:
-                        market_data[symbol] = pd.concat([data['opening'], data['closing']])
-                
-                # Process trades
-                new_trades = self.process_tweet(tweet, market_data)
-                self.trades.extend(new_trades)
-                tweets_processed += 1
-
-            # Get tweets for the day
-            self.twitter_stream.start_stream(
-                handles=[handle],
-                callback=tweet_callback,
-                is_backtest=True
-            )
-
-            current_date += timedelta(days=1)
-            tweets_processed = 0
+                    self.trades.extend(new_trades)
 
         self.calculate_performance()
 
+    def _fetch_market_data(
+        self,
+        symbols: Set[str],
+        date: datetime,
+        window_minutes: int,
+        executor: ThreadPoolExecutor
+    ) -> Dict[str, OHLCV]:
+        """Fetch opening/closing OHLCV arrays for many symbols concurrently"""
+        symbols = list(symbols)
+        fetched = executor.map(
+            lambda symbol: self.historical_data.get_opening_closing_arrays(
+                symbol,
+                date,
+                window_minutes=window_minutes
+            ),
+            symbols
+        )
+        return {symbol: data for symbol, data in zip(symbols, fetched) if data is not None}
+
+    def _record_trade(self, symbol: str, pnl: float, entry_ts_ns: int):
+        """Append a closed trade to the store and update running aggregates"""
+        self.trade_store.append(self._sid(symbol), pnl, entry_ts_ns)
+
+        win = pnl > 0
+        self._n += 1
+        self._wins += win
+        self._sum_pnl += pnl
+
+        # Welford update for the P&L mean and variance
+        delta = pnl - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (pnl - self._mean)
+
+        if win:
+            self._gross_profit += pnl
+        else:
+            self._gross_loss -= pnl
+
+        # Drawdown of cumulative P&L from its running peak (starting at 0)
+        self._equity += pnl
+        self._peak = max(self._peak, self._equity)
+        self._max_drawdown = min(self._max_drawdown, self._equity - self._peak)
+
+        entry_hour = ist_hour(entry_ts_ns)
+        if entry_hour < 10:
+            self._open_n += 1
+            self._open_wins += win
+            self._open_pnl += pnl
+        elif entry_hour > 14:
+            self._close_n += 1
+            self._close_wins += win
+            self._close_pnl += pnl
+
+    def calculate_performance(self):
+        """Calculate overall performance metrics for the simulated trades"""
+        n = self._n
+        std = math.sqrt(self._m2 / n) if n > 1 else 0.0
+
+        if self._gross_loss > 0:
+            profit_factor = self._gross_profit / self._gross_loss
+        else:
+            profit_factor = float('inf') if self._gross_profit > 0 else 0.0
+
+        self.performance_metrics = {
+            'total_trades': n,
+            'profitable_trades': self._wins,
+            'win_rate': self._wins / n if n else 0.0,
+            'total_pnl': self._sum_pnl,
+            'avg_trade_pnl': self._mean,
+            'sharpe_ratio': self._mean / std if std > 0 else 0.0,
+            'profit_factor': profit_factor,
+            'max_drawdown': self._max_drawdown,
+            'opening_trades': self._open_n,
+            'opening_pnl': self._open_pnl,
+            'opening_win_rate': self._open_wins / max(self._open_n, 1),
+            'closing_trades': self._close_n,
+            'closing_pnl': self._close_pnl,
+            'closing_win_rate': self._close_wins / max(self._close_n, 1)
+        }
+
+        self.calculate_symbol_metrics()
+
+    def _sid(self, symbol: str) -> int:
+        """Return the interned integer id for a symbol"""
+        sid = self._symbol_to_id.get(symbol)
+        if sid is None:
+            sid = len(self._id_to_symbol)
+            self._symbol_to_id[symbol] = sid
+            self._id_to_symbol.append(symbol)
+        return sid
+
     def calculate_symbol_metrics(self):
         """Calculate performance metrics for each symbol"""
-        for symbol in self.symbols_traded:
-            symbol_trades = [t for t in self.trades if t.symbol == symbol]
-            
-            if not symbol_trades:
-                continue
-                
-            total_trades = len(symbol_trades)
-            profitable_trades = len([t for t in symbol_trades if t.pnl > 0])
-            total_pnl = sum(t.pnl for t in symbol_trades)
-            
-            self.symbol_metrics[symbol] = {
-                'total_trades': total_trades,
-                'profitable_trades': profitable_trades,
-                'win_rate': profitable_trades / total_trades if total_trades > 0 else 0,
-                'total_pnl': total_pnl,
-                'avg_trade_pnl': total_pnl / total_trades if total_trades > 0 else 0
+        if not len(self.trade_store):
+            return
+
+        sids = self.trade_store.symbol_ids
+        pnl = self.trade_store.pnl
+        n_symbols = len(self._id_to_symbol)
+
+        # One pass per column over contiguous int32 ids
+        total_trades = np.bincount(sids, minlength=n_symbols)
+        profitable_trades = np.bincount(sids, weights=pnl > 0, minlength=n_symbols)
+        total_pnl = np.bincount(sids, weights=pnl, minlength=n_symbols)
+
+        self.symbol_metrics = {}
+        for sid in np.flatnonzero(total_trades):
+            trades = int(total_trades[sid])
+            self.symbol_metrics[self._id_to_symbol[sid]] = {
+                'total_trades': trades,
+                'profitable_trades': int(profitable_trades[sid]),
+                'total_pnl': float(total_pnl[sid]),
+                'win_rate': float(profitable_trades[sid] / trades),
+                'avg_trade_pnl': float(total_pnl[sid] / trades)
             }
 
     def generate_report(self) -> str:
@@ -1,6 +1,7 @@
+from functools import lru_cache
 from typing import Dict, List
 from datetime import time
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 class Settings(BaseSettings):
@@ -10,6 +11,8 @@ class Settings(BaseSettings):
     TWITTER_ACCESS_TOKEN: str = Field(default="")
     TWITTER_ACCESS_TOKEN_SECRET: str = Field(default="")
     TWITTER_BEARER_TOKEN: str = Field(default="")  # Added Bearer Token
+    # Extra app bearer tokens; read requests rotate across these and TWITTER_BEARER_TOKEN
+    TWITTER_BEARER_TOKENS: List[str] = Field(default=[])
 
     # Zerodha Credentials
     KITE_API_KEY: str = Field(default="")
@@ -35,6 +38,8 @@ class Settings(BaseSettings):
         'NEGATIVE': 0.4,
         'SUPER_NEGATIVE': 0.2
     })
+    # Directory of the quantized ONNX export (see sentiment/export_onnx.py)
+    SENTIMENT_ONNX_DIR: str = Field(default='sentiment_model_onnx')
 
     # Trading Configuration
     TRADE_AMOUNT: float = Field(default=10000.0)
@@ -47,10 +52,17 @@ class Settings(BaseSettings):
     BACKTEST_END_DATE: str = Field(default='2024-12-31')
     TWEETS_PER_DAY_LIMIT: int = Field(default=100)
     CACHE_TWEETS: bool = Field(default=True)
+    # Seconds an in-memory tweet cache entry is trusted before re-checking the file
+    CACHE_TTL: int = Field(default=300)
 
-    class Config:
-        env_file = '.env'
-        case_sensitive = False
-        env_prefix = ""
+    model_config = SettingsConfigDict(
+        env_file='.env',
+        case_sensitive=False,
+        env_prefix="",
+        extra='ignore'
+    )
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, validated once on first use"""
+    return Settings()
\ No newline at end of file
@@ -1,19 +1,42 @@
+import functools
+import hashlib
+import orjson
 import os
+import time
 from typing import Dict, List, Optional
 import logging
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
+# Load environment variables once and snapshot them for lookups
+load_dotenv()
+_ENV = dict(os.environ)
+
+# Successful connection tests are trusted for this long, across restarts
+CONNECTION_CACHE_TTL = 12 * 3600
+CONNECTION_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'twitter-sentiment-trader', 'validation.json'
+)
+
+_CREDENTIAL_VARS = [
+    'TWITTER_API_KEY',
+    'TWITTER_API_SECRET',
+    'TWITTER_ACCESS_TOKEN',
+    'TWITTER_ACCESS_TOKEN_SECRET',
+    'KITE_API_KEY',
+    'KITE_API_SECRET'
+]
+
 class ConfigValidator:
+    _connection_cache: Optional[Dict] = None
+
     @staticmethod
+    @functools.lru_cache()
     def validate_twitter_credentials() -> Dict[str, str]:
         """Validate and return Twitter credentials"""
         logger.debug("Validating Twitter credentials")
         
-        # Load environment variables
-        load_dotenv()
-        
         # Required credentials
         required_creds = [
             'TWITTER_API_KEY',
@@ -23,13 +46,8 @@ class ConfigValidator:
         ]
         
         # Check each credential
-        creds = {}
-        missing_creds = []
-        for cred in required_creds:
-            value = os.getenv(cred)
-            if not value:
-                missing_creds.append(cred)
-            creds[cred.lower()] = value
+        creds = {cred.lower(): _ENV.get(cred) for cred in required_creds}
+        missing_creds = [cred for cred in required_creds if not creds[cred.lower()]]
             
         if missing_creds:
             logger.error(f"Missing Twitter credentials: {missing_creds}")
@@ -39,6 +57,7 @@ class ConfigValidator:
         return creds
 
     @staticmethod
+    @functools.lru_cache()
     def validate_zerodha_credentials() -> Dict[str, str]:
         """Validate and return Zerodha credentials"""
         logger.debug("Validating Zerodha credentials")
@@ -50,13 +69,8 @@ class ConfigValidator:
         ]
         
         # Check each credential
-        creds = {}
-        missing_creds = []
-        for cred in required_creds:
-            value = os.getenv(cred)
-            if not value:
-                missing_creds.append(cred)
-            creds[cred.lower()] = value
+        creds = {cred.lower(): _ENV.get(cred) for cred in required_creds}
+        missing_creds = [cred for cred in required_creds if not creds[cred.lower()]]
             
         if missing_creds:
             logger.error(f"Missing Zerodha credentials: {missing_creds}")
@@ -65,9 +79,66 @@ class ConfigValidator:
         logger.info("Zerodha credentials validation successful")
         return creds
 
+    @staticmethod
+    def _credentials_fingerprint() -> str:
+        """Hash of the credentials, so cached results die with a credential change"""
+        joined = '\0'.join(_ENV.get(var) or '' for var in _CREDENTIAL_VARS)
+        return hashlib.sha256(joined.encode()).hexdigest()
+
+    @staticmethod
+    def _load_connection_cache() -> Optional[Dict]:
+        """Return the cached successful test results if still fresh"""
+        cache = ConfigValidator._connection_cache
+        if cache is None and os.path.exists(CONNECTION_CACHE_PATH):
+            try:
+                with open(CONNECTION_CACHE_PATH, 'rb') as f:
+                    cache = orjson.loads(f.read())
+                ConfigValidator._connection_cache = cache
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable validation cache: {str(e)}")
+                return None
+
+        if (
+            cache
+            and cache.get('fingerprint') == ConfigValidator._credentials_fingerprint()
+            and time.time() - cache.get('timestamp', 0) < CONNECTION_CACHE_TTL
+            and all(cache['results'].values())
+        ):
+            return cache
+        return None
+
+    @staticmethod
+    def _save_connection_cache(results: Dict[str, bool]):
+        """Remember successful test results in memory and on disk"""
+        cache = {
+            'timestamp': time.time(),
+            'fingerprint': ConfigValidator._credentials_fingerprint(),
+            'results': results
+        }
+        ConfigValidator._connection_cache = cache
+        try:
+            os.makedirs(os.path.dirname(CONNECTION_CACHE_PATH), exist_ok=True)
+            with open(CONNECTION_CACHE_PATH, 'wb') as f:
+                f.write(orjson.dumps(cache))
+        except Exception as e:
+            logger.warning(f"Could not write validation cache: {str(e)}")
+
     @staticmethod
     def test_connections() -> Dict[str, bool]:
-        """Test all API connections"""
+        """Test all API connections, reusing recent successful results"""
+        cache = ConfigValidator._load_connection_cache()
+        if cache is not None:
+            logger.info("Using cached API connection test results")
+            return dict(cache['results'])
+
+        results = ConfigValidator._run_connection_tests()
+        if all(results.values()):
+            ConfigValidator._save_connection_cache(results)
+        return results
+
+    @staticmethod
+    def _run_connection_tests() -> Dict[str, bool]:
+        """Test all API connections against the live services"""
         logger.info("Testing API connections")
         results = {}
         
@@ -1,12 +1,18 @@
+import asyncio
 import os
+import re
 import time
-from datetime import datetime
+from typing import List, Optional
 from dotenv import load_dotenv
 from twitter.stream import TwitterStream
 from sentiment.analyzer import SentimentAnalyzer
 from trading.trader import Trader
-from models.trade import Trade
-from config.settings import settings
+from models.tweet import Tweet
+from config.settings import get_settings
+
+CASHTAG_PATTERN = re.compile(r'\$([A-Z]{2,10})')
+# Longest wait between attempts to reopen a failing filtered stream
+MAX_STREAM_BACKOFF = 15 * 60
 
 class TweetSentimentTrader:
     def __init__(self):
@@ -18,7 +24,8 @@ class TweetSentimentTrader:
             api_key=os.getenv('TWITTER_API_KEY'),
             api_secret=os.getenv('TWITTER_API_SECRET'),
             access_token=os.getenv('TWITTER_ACCESS_TOKEN'),
-            access_token_secret=os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
+            access_token_secret=os.getenv('TWITTER_ACCESS_TOKEN_SECRET'),
+            bearer_token=os.getenv('TWITTER_BEARER_TOKEN')
         )
 
         self.sentiment_analyzer = SentimentAnalyzer()
@@ -28,65 +35,130 @@ class TweetSentimentTrader:
             api_secret=os.getenv('KITE_API_SECRET')
         )
 
-    def process_tweet(self, tweet):
-        """Process incoming tweet and make trading decisions"""
-        # Analyze sentiment
-        sentiment = self.sentiment_analyzer.analyze(tweet)
-        tweet.sentiment = sentiment
+    async def process_tweets(self, tweets: List[Tweet]):
+        """Analyze a batch of tweets in one model call, then trade on each"""
+        # Only tweets naming a symbol can lead to a trade, so skip inference for the rest
+        candidates = [(tweet, symbol) for tweet in tweets if (symbol := self.extract_symbol(tweet.text))]
+        sentiments = self.sentiment_analyzer.analyze_batch([tweet for tweet, _ in candidates])
+        for (tweet, _), sentiment in zip(candidates, sentiments):
+            tweet.sentiment = sentiment
 
-        # If super positive sentiment, place trade
-        if sentiment == 'SUPER_POSITIVE':
-            # Extract stock symbol from tweet (implement your logic here)
+        # Quote every symbol the batch will trade in one request
+        buy_symbols = list(dict.fromkeys(
+            symbol for tweet, symbol in candidates if tweet.sentiment == 'SUPER_POSITIVE'
+        ))
+        prices = await asyncio.to_thread(self.trader.get_ltps, buy_symbols) if buy_symbols else {}
+        for tweet, symbol in candidates:
+            await self.process_tweet(tweet, symbol, price=prices.get(symbol))
+
+    async def process_tweet(self, tweet, symbol: Optional[str] = None, price: Optional[float] = None):
+        """Process incoming tweet and make trading decisions"""
+        # Symbol extraction is cheap; reject tweets without one before running the model
+        if symbol is None:
             symbol = self.extract_symbol(tweet.text)
-            if symbol:
-                # Get current price
-                price = self.trader.get_ltp(symbol)
-                if price:
-                    # Calculate quantity based on settings.TRADE_AMOUNT
-                    quantity = int(settings.TRADE_AMOUNT / price)
-                    
-                    # Place buy order
-                    order_id = self.trader.place_trade(symbol, quantity, 'BUY')
-                    if order_id:
-                        # Create trade record
-                        trade = Trade(
-                            symbol=symbol,
-                            entry_price=price,
-                            quantity=quantity,
-                            entry_time=datetime.now(),
-                            tweet_id=tweet.id,
-                            handle=tweet.author,
-                            sentiment=sentiment,
-                            status='OPEN'
-                        )
-                        # Store trade for tracking
-                        self.trader.positions[order_id] = trade
-
-    def extract_symbol(self, text: str) -> str:
+        if not symbol:
+            return
+
+        # Analyze sentiment unless already filled in by a batch run
+        if tweet.sentiment is None:
+            tweet.sentiment = self.sentiment_analyzer.analyze(tweet)
+        sentiment = tweet.sentiment
+
+        # Only super positive sentiment places a trade
+        if sentiment != 'SUPER_POSITIVE':
+            return
+        settings = get_settings()
+
+        # Get current price, unless quoted already for the batch
+        if price is None:
+            price = await asyncio.to_thread(self.trader.get_ltp, symbol)
+        if price:
+            # Calculate quantity based on settings.TRADE_AMOUNT
+            quantity = int(settings.TRADE_AMOUNT / price)
+
+            # Place buy order
+            order_id = await asyncio.to_thread(self.trader.place_trade, symbol, quantity, 'BUY')
+            if order_id:
+                # Record the position for tracking
+                self.trader.positions.add(
+                    order_id,
+                    symbol=symbol,
+                    entry_price=price,
+                    quantity=quantity,
+                    entry_ts_ns=time.time_ns(),
+                    tweet_id=tweet.id,
+                    handle=tweet.author,
+                    sentiment=sentiment
+                )
+
+    def extract_symbol(self, text: str) -> Optional[str]:
         """Extract stock symbol from tweet text"""
-        # Implement your symbol extraction logic here
-        # This could involve looking for cashtags ($AAPL) or company names
-        # For now, return None
-        return None
+        # First cashtag ($RELIANCE) in the tweet, if any
+        match = CASHTAG_PATTERN.search(text)
+        return match.group(1) if match else None
 
-    def run(self):
-        """Main application loop"""
-        print("Starting Tweet Sentiment Trader...")
-        
+    async def consume(self, queue: asyncio.Queue):
+        """Trade on streamed tweets, batching whatever arrived since the last pass"""
         while True:
+            batch: List[Tweet] = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
             try:
-                # Start streaming tweets
-                self.twitter_stream.start_stream(
-                    handles=settings.TWITTER_HANDLES,
-                    callback=self.process_tweet
+                await self.process_tweets(batch)
+            except Exception as e:
+                print(f"Error processing tweets: {str(e)}")
+
+    async def stream_tweets(self, handles: List[str], on_tweet):
+        """
+        Keep the filtered stream running, catching up by polling whenever it is down
+
+        The stream can end (no handle resolved, or a disconnect) or fail (no
+        filtered-stream access, network errors). Either way, tweets posted in
+        the gap are polled for and the stream is reopened after a delay. The
+        delay starts at TWEET_FETCH_INTERVAL and doubles while it keeps failing.
+        """
+        settings = get_settings()
+        delay = settings.TWEET_FETCH_INTERVAL
+        while True:
+            try:
+                await asyncio.to_thread(
+                    self.twitter_stream.start_filtered_stream,
+                    handles=handles,
+                    callback=on_tweet
                 )
-                
-                # Sleep for the configured interval
-                time.sleep(settings.TWEET_FETCH_INTERVAL)
-                
+                print("Filtered stream ended; reconnecting")
+                delay = settings.TWEET_FETCH_INTERVAL
+            except Exception as e:
+                print(f"Filtered stream failed: {str(e)}")
+                delay = min(delay * 2, MAX_STREAM_BACKOFF)
+
+            try:
+                await asyncio.to_thread(self.twitter_stream.catch_up, handles, on_tweet)
             except Exception as e:
-                print(f"Error in main loop: {str(e)}")
-                time.sleep(5)  # Wait before retrying
+                print(f"Error catching up on tweets: {str(e)}")
+            await asyncio.sleep(delay)
+
+    async def run_async(self):
+        """Stream tweets from the configured handles and trade on them as they arrive"""
+        settings = get_settings()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        # The stream delivers tweets on its own thread; hand them to the event loop
+        def on_tweet(tweet: Tweet):
+            loop.call_soon_threadsafe(queue.put_nowait, tweet)
+
+        consumer = asyncio.create_task(self.consume(queue))
+        try:
+            await self.stream_tweets(settings.TWITTER_HANDLES, on_tweet)
+        finally:
+            # Don't leave the consumer waiting on a queue nothing feeds any more
+            consumer.cancel()
+
+    def run(self):
+        """Main application loop"""
+        print("Starting Tweet Sentiment Trader...")
+        asyncio.run(self.run_async())
 
 if __name__ == "__main__":
     trader = TweetSentimentTrader()
@@ -0,0 +1,91 @@
+from array import array
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from .trade import Trade
+
+class OpenPositions:
+    """
+    Columnar (struct-of-arrays) book of open positions keyed by order id
+
+    Numeric fields live in typed buffers so the whole book can be valued
+    with one vectorized expression; Trade objects are only built on demand.
+    """
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._order_ids: List[str] = []
+        self._symbols: List[str] = []
+        self._entry_price = array('d')
+        self._quantity = array('i')
+        self._entry_ts = array('q')
+        self._tweet_ids: List[str] = []
+        self._handles: List[str] = []
+        self._sentiments: List[str] = []
+
+    def add(
+        self,
+        order_id: str,
+        symbol: str,
+        entry_price: float,
+        quantity: int,
+        entry_ts_ns: int,
+        tweet_id: str,
+        handle: str,
+        sentiment: str
+    ):
+        """Record a newly opened position; entry_ts_ns is int64 UTC nanoseconds"""
+        self._index[order_id] = len(self._order_ids)
+        self._order_ids.append(order_id)
+        self._symbols.append(symbol)
+        self._entry_price.append(entry_price)
+        self._quantity.append(quantity)
+        self._entry_ts.append(entry_ts_ns)
+        self._tweet_ids.append(tweet_id)
+        self._handles.append(handle)
+        self._sentiments.append(sentiment)
+
+    def __len__(self) -> int:
+        return len(self._order_ids)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._index
+
+    def get(self, order_id: str) -> Trade:
+        """Materialize a single position as a Trade record"""
+        i = self._index[order_id]
+        return Trade(
+            symbol=self._symbols[i],
+            entry_price=self._entry_price[i],
+            quantity=self._quantity[i],
+            entry_time=pd.Timestamp(self._entry_ts[i], tz='UTC').tz_convert('Asia/Kolkata'),
+            tweet_id=self._tweet_ids[i],
+            handle=self._handles[i],
+            sentiment=self._sentiments[i],
+            status='OPEN'
+        )
+
+    @property
+    def order_ids(self) -> List[str]:
+        return list(self._order_ids)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    @property
+    def entry_price(self) -> np.ndarray:
+        # Copy out of the buffer so the array.array can keep growing
+        return np.frombuffer(self._entry_price, dtype=np.float64).copy()
+
+    @property
+    def quantity(self) -> np.ndarray:
+        return np.frombuffer(self._quantity, dtype=np.int32).copy()
+
+    @property
+    def entry_ts(self) -> np.ndarray:
+        return np.frombuffer(self._entry_ts, dtype=np.int64).copy()
+
+    def unrealized_pnl(self, ltp: np.ndarray) -> np.ndarray:
+        """Mark-to-market P&L per position, given last prices aligned with symbols"""
+        return (np.asarray(ltp, dtype=np.float64) - self.entry_price) * self.quantity
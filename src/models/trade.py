@@ -1,16 +1,17 @@
+from dataclasses import dataclass
 from datetime import datetime
-from pydantic import BaseModel
 from typing import Optional
 
-class Trade(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Trade:
     symbol: str
     entry_price: float
-    exit_price: Optional[float]
+    exit_price: Optional[float] = None
     quantity: int
     entry_time: datetime
-    exit_time: Optional[datetime]
+    exit_time: Optional[datetime] = None
     tweet_id: str
     handle: str
     sentiment: str
-    pnl: Optional[float]
-    status: str  # 'OPEN' or 'CLOSED'
\ No newline at end of file
+    pnl: Optional[float] = None
+    status: str  # 'OPEN' or 'CLOSED'
@@ -0,0 +1,69 @@
+from array import array
+from typing import Dict, Iterable
+import numpy as np
+import pandas as pd
+from .trade import Trade
+
+NS_PER_HOUR = 3_600_000_000_000
+# Asia/Kolkata is a fixed UTC+05:30 offset (no DST)
+IST_OFFSET_NS = 19_800_000_000_000
+
+def ist_hour(ts_ns):
+    """Hour of day in IST for int64 UTC nanosecond timestamp(s)"""
+    return (ts_ns + IST_OFFSET_NS) // NS_PER_HOUR % 24
+
+class TradeStore:
+    """
+    Columnar (struct-of-arrays) log of closed trades
+
+    Each field lives in its own typed buffer so aggregations run over
+    contiguous NumPy arrays instead of walking Trade objects.
+    """
+
+    def __init__(self):
+        self._symbol_ids = array('i')
+        self._pnl = array('d')
+        self._entry_ts = array('q')
+
+    @classmethod
+    def from_trades(cls, trades: Iterable[Trade]) -> 'TradeStore':
+        """
+        Build a store from existing Trade objects
+
+        Symbol ids are assigned in order of first appearance.
+        """
+        store = cls()
+        symbol_to_id: Dict[str, int] = {}
+        for trade in trades:
+            symbol_id = symbol_to_id.setdefault(trade.symbol, len(symbol_to_id))
+            entry_time = pd.Timestamp(trade.entry_time)
+            if entry_time.tzinfo is None:
+                entry_time = entry_time.tz_localize('Asia/Kolkata')
+            store.append(symbol_id, trade.pnl, entry_time.value)
+        return store
+
+    def append(self, symbol_id: int, pnl: float, entry_ts_ns: int):
+        """Record a closed trade; entry_ts_ns is int64 UTC nanoseconds"""
+        self._symbol_ids.append(symbol_id)
+        self._pnl.append(pnl)
+        self._entry_ts.append(entry_ts_ns)
+
+    def __len__(self) -> int:
+        return len(self._pnl)
+
+    @property
+    def symbol_ids(self) -> np.ndarray:
+        # Copy out of the buffer so the array.array can keep growing
+        return np.frombuffer(self._symbol_ids, dtype=np.int32).copy()
+
+    @property
+    def pnl(self) -> np.ndarray:
+        return np.frombuffer(self._pnl, dtype=np.float64).copy()
+
+    @property
+    def entry_ts(self) -> np.ndarray:
+        return np.frombuffer(self._entry_ts, dtype=np.int64).copy()
+
+    @property
+    def entry_hour(self) -> np.ndarray:
+        return ist_hour(np.frombuffer(self._entry_ts, dtype=np.int64))
@@ -1,9 +1,25 @@
+from dataclasses import dataclass
 from datetime import datetime
-from pydantic import BaseModel
+from typing import Any, Mapping, Optional
 
-class Tweet(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Tweet:
     id: str
     text: str
     author: str
     created_at: datetime
-    sentiment: str = None
\ No newline at end of file
+    sentiment: Optional[str] = None
+
+    @classmethod
+    def model_validate(cls, data: Mapping[str, Any]) -> 'Tweet':
+        """Build a Tweet from API or cache data, coercing field types"""
+        created_at = data['created_at']
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        return cls(
+            id=str(data['id']),
+            text=str(data['text']),
+            author=str(data['author']),
+            created_at=created_at,
+            sentiment=data.get('sentiment')
+        )
\ No newline at end of file
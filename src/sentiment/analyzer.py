@@ -1,27 +1,90 @@
-from transformers import pipeline
-from typing import Dict
+import os
+import numpy as np
+from typing import Dict, List
 from ..models.tweet import Tweet
-from ..config.settings import settings
+from ..config.settings import get_settings
+
+MODEL_NAME = 'finiteautomata/bertweet-base-sentiment-analysis'
+ONNX_MODEL_FILE = 'model.int8.onnx'
+
+# Labels indexed by searchsorted position against the threshold pairs
+_LOW_LABELS = np.array(['SUPER_NEGATIVE', 'NEGATIVE', 'NEUTRAL'])
+_HIGH_LABELS = np.array(['', 'POSITIVE', 'SUPER_POSITIVE'])
 
 class SentimentAnalyzer:
-    def __init__(self):
-        self.sentiment_pipeline = pipeline(
-            'sentiment-analysis',
-            model='finiteautomata/bertweet-base-sentiment-analysis'
-        )
+    def __init__(self, batch_size: int = 32):
+        settings = get_settings()
+        self._batch_size = batch_size
+        self._session = None
+
+        # Thresholds are fixed for the process; bind them once as sorted search arrays
+        thresholds = settings.SENTIMENT_THRESHOLDS
+        self._low_th = np.array([thresholds['SUPER_NEGATIVE'], thresholds['NEGATIVE']])
+        self._high_th = np.array([thresholds['POSITIVE'], thresholds['SUPER_POSITIVE']])
+
+        # Prefer the quantized ONNX export when it has been generated
+        onnx_path = os.path.join(settings.SENTIMENT_ONNX_DIR, ONNX_MODEL_FILE)
+        if os.path.exists(onnx_path):
+            import onnxruntime
+            from transformers import AutoTokenizer
+            # Pool workers cap their thread budget via OMP_NUM_THREADS; 0 lets ONNX Runtime pick
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = int(os.environ.get('OMP_NUM_THREADS', 0))
+            self._session = onnxruntime.InferenceSession(
+                onnx_path,
+                sess_options=options,
+                providers=['CPUExecutionProvider']
+            )
+            self._input_names = [i.name for i in self._session.get_inputs()]
+            self._tokenizer = AutoTokenizer.from_pretrained(settings.SENTIMENT_ONNX_DIR)
+        else:
+            # torch is only needed here; importing it costs seconds and a thread pool per process
+            import torch
+            from transformers import pipeline
+            self.sentiment_pipeline = pipeline(
+                'sentiment-analysis',
+                model=MODEL_NAME,
+                device=0 if torch.cuda.is_available() else -1
+            )
+            self._pipeline_kwargs = {'batch_size': batch_size, 'truncation': True}
 
     def analyze(self, tweet: Tweet) -> str:
         """Analyze tweet sentiment and return category"""
-        result = self.sentiment_pipeline(tweet.text)[0]
-        score = result['score']
-
-        if score >= settings.SENTIMENT_THRESHOLDS['SUPER_POSITIVE']:
-            return 'SUPER_POSITIVE'
-        elif score >= settings.SENTIMENT_THRESHOLDS['POSITIVE']:
-            return 'POSITIVE'
-        elif score <= settings.SENTIMENT_THRESHOLDS['SUPER_NEGATIVE']:
-            return 'SUPER_NEGATIVE'
-        elif score <= settings.SENTIMENT_THRESHOLDS['NEGATIVE']:
-            return 'NEGATIVE'
-        else:
-            return 'NEUTRAL'
\ No newline at end of file
+        return self.analyze_batch([tweet])[0]
+
+    def analyze_batch(self, tweets: List[Tweet]) -> List[str]:
+        """Analyze many tweets in batched model calls and return their categories"""
+        if not tweets:
+            return []
+        return self._categorize(self._scores([t.text for t in tweets]))
+
+    def _scores(self, texts: List[str]) -> np.ndarray:
+        """Top-label probability for each text"""
+        if self._session is None:
+            results = self.sentiment_pipeline(texts, **self._pipeline_kwargs)
+            return np.fromiter((r['score'] for r in results), dtype=np.float64)
+
+        scores = []
+        for start in range(0, len(texts), self._batch_size):
+            encoded = self._tokenizer(
+                texts[start:start + self._batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors='np'
+            )
+            logits = self._session.run(None, {name: encoded[name] for name in self._input_names})[0]
+            # Softmax on numpy; the max probability matches the pipeline's score
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            scores.append(probs.max(axis=1))
+        return np.concatenate(scores).astype(np.float64)
+
+    def _categorize(self, scores: np.ndarray) -> List[str]:
+        """Map model scores to sentiment categories"""
+        # 0: <= SUPER_NEGATIVE, 1: <= NEGATIVE, 2: neither
+        low = np.searchsorted(self._low_th, scores, side='left')
+        # 0: below POSITIVE, 1: >= POSITIVE, 2: >= SUPER_POSITIVE
+        high = np.searchsorted(self._high_th, scores, side='right')
+        # Positive checks take precedence, as in the original if/elif chain
+        return np.where(high > 0, _HIGH_LABELS[high], _LOW_LABELS[low]).tolist()
@@ -0,0 +1,31 @@
+import argparse
+import os
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from optimum.onnxruntime import ORTModelForSequenceClassification
+from transformers import AutoTokenizer
+from .analyzer import MODEL_NAME, ONNX_MODEL_FILE
+from ..config.settings import get_settings
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description='Export the sentiment model to a quantized int8 ONNX file')
+    parser.add_argument('--output-dir', type=str, default=settings.SENTIMENT_ONNX_DIR,
+                        help=f'Directory for the exported model (default: {settings.SENTIMENT_ONNX_DIR})')
+    
+    args = parser.parse_args()
+    
+    # Export the FP32 model and tokenizer
+    model = ORTModelForSequenceClassification.from_pretrained(MODEL_NAME, export=True)
+    model.save_pretrained(args.output_dir)
+    AutoTokenizer.from_pretrained(MODEL_NAME).save_pretrained(args.output_dir)
+    
+    # Quantize weights to int8; activations are quantized dynamically at runtime
+    quantize_dynamic(
+        os.path.join(args.output_dir, 'model.onnx'),
+        os.path.join(args.output_dir, ONNX_MODEL_FILE),
+        weight_type=QuantType.QInt8
+    )
+    print(f"Saved quantized model to {os.path.join(args.output_dir, ONNX_MODEL_FILE)}")
+
+if __name__ == "__main__":
+    main()
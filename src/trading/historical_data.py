@@ -1,29 +1,126 @@
-from typing import Optional, Dict, List
+import fcntl
+import multiprocessing
+import os
+import tempfile
+import threading
+import time as time_module
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Dict, Iterator, List, Tuple
+from collections import namedtuple
 from datetime import datetime, timedelta
+import numpy as np
+import orjson
 import pandas as pd
 from kiteconnect import KiteConnect
-import pytz
+from zoneinfo import ZoneInfo
+
+IST = ZoneInfo('Asia/Kolkata')
+NS_PER_MINUTE = 60_000_000_000
+
+# Longest date range Kite serves per historical_data request, by interval
+MAX_SPAN_DAYS = {
+    'minute': 60,
+    '3minute': 100,
+    '5minute': 100,
+    '10minute': 100,
+    '15minute': 200,
+    '30minute': 200,
+    '60minute': 400,
+    'day': 2000
+}
+
+# Kite allows 3 historical data requests per second
+HISTORICAL_REQUESTS_PER_SECOND = 3
+MAX_FETCH_WORKERS = 8
+# Most (symbol, day, window) array sets a fetcher keeps in memory
+DAY_ARRAYS_CACHE_SIZE = 4096
+
+class _RateLimiter:
+    """Allow at most `rate` calls per rolling second across threads and processes"""
+
+    def __init__(self, rate: int):
+        # Start times of the last `rate` calls, in shared memory so pool workers
+        # handed this limiter (via initargs) draw on the same budget as the parent
+        self._calls = multiprocessing.Array('d', rate)
+
+    def acquire(self):
+        """Block until a call is allowed, then record it"""
+        with self._calls.get_lock():
+            calls = self._calls.get_obj()
+            slot = min(range(len(calls)), key=calls.__getitem__)
+            # Holding the lock while waiting queues every other caller behind this one
+            wait = calls[slot] + 1.0 - time_module.time()
+            if wait > 0:
+                time_module.sleep(wait)
+            calls[slot] = time_module.time()
+
+# Columns Kite returns for a historical request, besides the 'date' index
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Coverage index and lock file inside each (symbol, interval) cache directory
+CACHE_INDEX_FILE = 'index.json'
+CACHE_LOCK_FILE = '.lock'
+
+# Struct-of-arrays view of a price frame; ts holds int64 UTC nanoseconds
+OHLCV = namedtuple('OHLCV', 'ts open high low close')
+
+def to_ohlcv(df: pd.DataFrame) -> OHLCV:
+    """Convert a price DataFrame indexed by timestamp into contiguous arrays"""
+    return OHLCV(
+        ts=np.ascontiguousarray(df.index.as_unit('ns').asi8),
+        open=np.ascontiguousarray(df['open'].to_numpy(dtype=np.float64)),
+        high=np.ascontiguousarray(df['high'].to_numpy(dtype=np.float64)),
+        low=np.ascontiguousarray(df['low'].to_numpy(dtype=np.float64)),
+        close=np.ascontiguousarray(df['close'].to_numpy(dtype=np.float64))
+    )
 
 class HistoricalDataFetcher:
-    def __init__(self, api_key: str, api_secret: str):
+    def __init__(self, api_key: str, api_secret: str, cache_dir: str = 'market_data_cache'):
         self.kite = KiteConnect(api_key=api_key)
         self._api_secret = api_secret
-        self.ist_tz = pytz.timezone('Asia/Kolkata')
-        self.cache: Dict[str, pd.DataFrame] = {}
+        self.ist_tz = IST
+        self.cache_dir = cache_dir
+        # Instrument lists by exchange, and NSE trading symbol -> instrument token
+        self._instruments: Dict[str, List[dict]] = {}
+        self._instrument_map: Optional[Dict[str, int]] = None
+        self._rate_limiter = _RateLimiter(HISTORICAL_REQUESTS_PER_SECOND)
+        # Opening/closing window arrays by (symbol, date ordinal, window), oldest first
+        self._day_arrays: Dict[Tuple[str, int, int], OHLCV] = {}
+        self._day_arrays_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks can't be pickled; a worker process starts with its own empty array cache
+        state = self.__dict__.copy()
+        del state['_day_arrays'], state['_day_arrays_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._day_arrays = {}
+        self._day_arrays_lock = threading.Lock()
 
     def login(self, request_token: str):
         """Complete Kite login process"""
         data = self.kite.generate_session(request_token, api_secret=self._api_secret)
         self.kite.set_access_token(data['access_token'])
 
+    def get_instruments(self, exchange: str) -> List[dict]:
+        """Get the instrument list for an exchange, downloaded once per fetcher"""
+        instruments = self._instruments.get(exchange)
+        if instruments is None:
+            instruments = self._instruments[exchange] = self.kite.instruments(exchange)
+        return instruments
+
     def get_instrument_token(self, symbol: str) -> Optional[int]:
         """Get instrument token for a symbol"""
         try:
-            instruments = self.kite.instruments("NSE")
-            for instrument in instruments:
-                if instrument['tradingsymbol'] == symbol:
-                    return instrument['instrument_token']
-            return None
+            if self._instrument_map is None:
+                # Built from the cached NSE list, so the download is shared with get_instruments
+                self._instrument_map = {
+                    instrument['tradingsymbol']: instrument['instrument_token']
+                    for instrument in self.get_instruments("NSE")
+                }
+            return self._instrument_map.get(symbol)
         except Exception as e:
             print(f"Error getting instrument token: {str(e)}")
             return None
@@ -50,9 +147,9 @@ class HistoricalDataFetcher:
         """
         try:
             # Check cache first
-            cache_key = f"{symbol}_{from_date.date()}_{to_date.date()}_{interval}"
-            if cache_key in self.cache:
-                return self.cache[cache_key]
+            cached = self._read_cache(symbol, interval, from_date, to_date)
+            if cached is not None:
+                return cached
 
             # Get instrument token
             token = self.get_instrument_token(symbol)
@@ -61,10 +158,11 @@ class HistoricalDataFetcher:
                 return None
 
             # Convert dates to IST
-            from_date_ist = self.ist_tz.localize(from_date)
-            to_date_ist = self.ist_tz.localize(to_date)
+            from_date_ist = from_date.replace(tzinfo=self.ist_tz)
+            to_date_ist = to_date.replace(tzinfo=self.ist_tz)
 
             # Fetch historical data
+            self._rate_limiter.acquire()
             data = self.kite.historical_data(
                 token,
                 from_date_ist,
@@ -77,11 +175,12 @@ class HistoricalDataFetcher:
                 return None
 
             # Convert to DataFrame
-            df = pd.DataFrame(data)
-            df.set_index('date', inplace=True)
+            # Build indexed in one pass and keep sorted so range slicing is a binary search
+            df = pd.DataFrame.from_records(data, index='date').sort_index()
 
-            # Cache the data
-            self.cache[cache_key] = df
+            # Only persist completed history; today's data is still changing
+            if to_date.date() < datetime.now().date():
+                self._write_cache(symbol, interval, from_date, to_date, df)
 
             return df
 
@@ -89,6 +188,111 @@ class HistoricalDataFetcher:
             print(f"Error fetching historical data: {str(e)}")
             return None
 
+    def _cache_paths(self, symbol: str, interval: str) -> Tuple[str, str]:
+        """Directory of parquet parts and its JSON coverage index for a (symbol, interval)"""
+        part_dir = os.path.join(self.cache_dir, f"{symbol}_{interval}")
+        return part_dir, os.path.join(part_dir, CACHE_INDEX_FILE)
+
+    @staticmethod
+    def _read_coverage(index_path: str) -> List[List[str]]:
+        """[from, to, part file] entries for the date ranges stored in a cache directory"""
+        if not os.path.exists(index_path):
+            return []
+        with open(index_path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    def _read_cache(
+        self,
+        symbol: str,
+        interval: str,
+        from_date: datetime,
+        to_date: datetime
+    ) -> Optional[pd.DataFrame]:
+        """Return cached bars for the range if a previous fetch covered it"""
+        part_dir, index_path = self._cache_paths(symbol, interval)
+        try:
+            start, end = from_date.isoformat(), to_date.isoformat()
+            part = next(
+                (name for lo, hi, name in self._read_coverage(index_path) if lo <= start and end <= hi),
+                None
+            )
+            if part is None:
+                return None
+
+            df = pd.read_parquet(os.path.join(part_dir, part), columns=PRICE_COLUMNS, memory_map=True)
+            df = df.loc[from_date.replace(tzinfo=self.ist_tz):to_date.replace(tzinfo=self.ist_tz)]
+            # A covered range without bars means the part doesn't hold them; refetch
+            return None if df.empty else df
+        except FileNotFoundError:
+            # The index names a part that has gone missing; refetch (the write prunes it)
+            return None
+        except Exception as e:
+            print(f"Error reading market data cache: {str(e)}")
+            return None
+
+    def _write_cache(
+        self,
+        symbol: str,
+        interval: str,
+        from_date: datetime,
+        to_date: datetime,
+        df: pd.DataFrame
+    ):
+        """
+        Store freshly fetched bars as a new part and record its range in the index
+
+        Each range is its own parquet part, so a write never re-reads or
+        rewrites bars stored earlier. Parts are written under unique temp
+        names and swapped in; the index update is serialized across threads
+        and pool worker processes with a file lock.
+        """
+        part_dir, index_path = self._cache_paths(symbol, interval)
+        part = f"{from_date:%Y%m%dT%H%M%S}_{to_date:%Y%m%dT%H%M%S}.parquet"
+        try:
+            os.makedirs(part_dir, exist_ok=True)
+            self._replace_atomically(
+                os.path.join(part_dir, part),
+                lambda f: df.to_parquet(f, engine='pyarrow', compression='zstd')
+            )
+            with open(os.path.join(part_dir, CACHE_LOCK_FILE), 'wb') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                # Ranges whose part file is missing are dropped, so they get refetched
+                coverage = [
+                    entry for entry in self._read_coverage(index_path)
+                    if entry[2] != part and os.path.exists(os.path.join(part_dir, entry[2]))
+                ]
+                coverage.append([from_date.isoformat(), to_date.isoformat(), part])
+                self._replace_atomically(index_path, lambda f: f.write(orjson.dumps(coverage)))
+        except Exception as e:
+            print(f"Error writing market data cache: {str(e)}")
+
+    @staticmethod
+    def _replace_atomically(path: str, write: Callable):
+        """Write a file via a uniquely named temp file beside it, then swap it in"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _date_chunks(
+        from_date: datetime,
+        to_date: datetime,
+        interval: str
+    ) -> Iterator[Tuple[datetime, datetime]]:
+        """Split a date range into the largest spans Kite serves per request"""
+        span = timedelta(days=MAX_SPAN_DAYS.get(interval, 60))
+        end_date = to_date + timedelta(days=1)
+        current_date = from_date
+        while current_date < end_date:
+            next_date = min(current_date + span, end_date)
+            yield current_date, next_date
+            current_date = next_date
+
     def get_historical_market_data(
         self,
         symbol: str,
@@ -100,40 +304,91 @@ class HistoricalDataFetcher:
         Fetch historical data for market hours only
         
         This function filters data to include only market hours and
-        handles data fetching in chunks to avoid API limits
+        fetches in the largest chunks Kite allows for the interval
         """
         try:
-            all_data = []
-            current_date = from_date
-
-            while current_date <= to_date:
-                next_date = current_date + timedelta(days=1)
-                
-                # Get data for current day
-                day_data = self.get_historical_data(
-                    symbol,
-                    current_date,
-                    next_date,
-                    interval
-                )
-
-                if day_data is not None:
-                    # Filter for market hours (9:15 AM to 3:30 PM IST)
-                    market_data = day_data.between_time('09:15', '15:30')
-                    all_data.append(market_data)
-
-                current_date = next_date
+            # Chunks are independent I/O-bound requests, so fetch them concurrently
+            chunks = list(self._date_chunks(from_date, to_date, interval))
+            with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(chunks) or 1)) as executor:
+                frames = list(executor.map(
+                    lambda chunk: self.get_historical_data(symbol, chunk[0], chunk[1], interval),
+                    chunks
+                ))
+            all_data = [frame for frame in frames if frame is not None]
 
             if not all_data:
                 return None
 
-            # Combine all data
-            return pd.concat(all_data)
+            # Combine all data, dropping bars repeated at chunk boundaries
+            data = pd.concat(all_data)
+            data = data[~data.index.duplicated(keep='first')]
+
+            # Filter for market hours (9:15 AM to 3:30 PM IST)
+            return data.between_time('09:15', '15:30')
 
         except Exception as e:
             print(f"Error fetching market data: {str(e)}")
             return None
 
+    def _get_day_arrays(self, symbol: str, date_ord: int, window_minutes: int) -> Optional[OHLCV]:
+        """Opening and closing window data for a day as OHLCV arrays (memoized)"""
+        key = (symbol, date_ord, window_minutes)
+        arrays = self._day_arrays.get(key)
+        if arrays is None:
+            arrays = self._load_day_arrays(symbol, date_ord, window_minutes)
+            # Only successes are kept; a None may be a transient fetch error worth retrying
+            if arrays is not None:
+                with self._day_arrays_lock:
+                    if len(self._day_arrays) >= DAY_ARRAYS_CACHE_SIZE:
+                        self._day_arrays.pop(next(iter(self._day_arrays)), None)
+                    self._day_arrays[key] = arrays
+        return arrays
+
+    def _load_day_arrays(self, symbol: str, date_ord: int, window_minutes: int) -> Optional[OHLCV]:
+        """Fetch a day and cut its opening and closing windows into OHLCV arrays"""
+        date = datetime.fromordinal(date_ord)
+        day_data = self.get_historical_data(
+            symbol,
+            date,
+            date + timedelta(days=1),
+            interval="minute"
+        )
+        if day_data is None or day_data.empty:
+            return None
+        day = to_ohlcv(day_data)
+
+        # Window bounds as epoch ns around 9:15 and 15:30 IST
+        midnight_ns = pd.Timestamp(date).tz_localize(self.ist_tz).value
+        open_min, close_min = 9 * 60 + 15, 15 * 60 + 30
+        lo = np.array([open_min - window_minutes, close_min - window_minutes]) * NS_PER_MINUTE + midnight_ns
+        hi = np.array([open_min + window_minutes, close_min + window_minutes]) * NS_PER_MINUTE + midnight_ns
+
+        # Binary search the sorted timestamps; both bounds are inclusive
+        lo_i = np.searchsorted(day.ts, lo, side='left')
+        hi_i = np.searchsorted(day.ts, hi, side='right')
+        selected = np.r_[lo_i[0]:hi_i[0], lo_i[1]:hi_i[1]]
+        if len(selected) == 0:
+            return None
+        arrays = OHLCV(*(column[selected] for column in day))
+        # The result is memoized and shared between callers, so guard it against mutation
+        for column in arrays:
+            column.flags.writeable = False
+        return arrays
+
+    def get_opening_closing_arrays(
+        self,
+        symbol: str,
+        date: datetime,
+        window_minutes: int = 30
+    ) -> Optional[OHLCV]:
+        """
+        Get opening and closing window data as OHLCV arrays
+
+        Each (symbol, date, window) is fetched and converted only once per
+        process; repeated calls return the same arrays.
+        """
+        return self._get_day_arrays(symbol, date.toordinal(), window_minutes)
+
     def get_opening_closing_data(
         self,
         symbol: str,
@@ -142,46 +397,25 @@ class HistoricalDataFetcher:
     ) -> Dict[str, pd.DataFrame]:
         """
         Get data around market opening and closing times
-        
+
         Args:
             symbol: Trading symbol
             date: Date to fetch data for
             window_minutes: Minutes before and after market open/close
-            
+
         Returns:
-            Dictionary with 'opening' and 'closing' DataFrames
+            Dictionary with 'opening' and 'closing' DataFrames of OHLC bars,
+            built from get_opening_closing_arrays
         """
-        try:
-            # Get full day data
-            day_data = self.get_historical_data(
-                symbol,
-                date,
-                date + timedelta(days=1),
-                interval="minute"
-            )
-
-            if day_data is None:
-                return {'opening': pd.DataFrame(), 'closing': pd.DataFrame()}
-
-            # Filter for opening window (9:15 AM ± window_minutes)
-            opening_start = pd.Timestamp('09:15', tz=self.ist_tz).time()
-            opening_data = day_data.between_time(
-                (pd.Timestamp('09:15', tz=self.ist_tz) - pd.Timedelta(minutes=window_minutes)).time(),
-                (pd.Timestamp('09:15', tz=self.ist_tz) + pd.Timedelta(minutes=window_minutes)).time()
-            )
+        arrays = self.get_opening_closing_arrays(symbol, date, window_minutes=window_minutes)
+        if arrays is None:
+            return {'opening': pd.DataFrame(), 'closing': pd.DataFrame()}
 
-            # Filter for closing window (3:30 PM ± window_minutes)
-            closing_start = pd.Timestamp('15:30', tz=self.ist_tz).time()
-            closing_data = day_data.between_time(
-                (pd.Timestamp('15:30', tz=self.ist_tz) - pd.Timedelta(minutes=window_minutes)).time(),
-                (pd.Timestamp('15:30', tz=self.ist_tz) + pd.Timedelta(minutes=window_minutes)).time()
-            )
-
-            return {
-                'opening': opening_data,
-                'closing': closing_data
-            }
-
-        except Exception as e:
-            print(f"Error fetching opening/closing data: {str(e)}")
-            return {'opening': pd.DataFrame(), 'closing': pd.DataFrame()}
\ No newline at end of file
+        index = pd.DatetimeIndex(pd.to_datetime(arrays.ts, utc=True), name='date').tz_convert(self.ist_tz)
+        frame = pd.DataFrame(
+            {'open': arrays.open, 'high': arrays.high, 'low': arrays.low, 'close': arrays.close},
+            index=index
+        )
+        # Bars before noon fall in the opening window, the rest in the closing one
+        is_opening = index.hour < 12
+        return {'opening': frame[is_opening], 'closing': frame[~is_opening]}
@@ -1,12 +1,11 @@
 from kiteconnect import KiteConnect
-from typing import Dict
-from ..models.trade import Trade
-from ..config.settings import settings
+from typing import Dict, List
+from ..models.open_positions import OpenPositions
 
 class Trader:
     def __init__(self, api_key: str, api_secret: str):
         self.kite = KiteConnect(api_key=api_key)
-        self.positions: Dict[str, Trade] = {}
+        self.positions = OpenPositions()
         self._api_secret = api_secret
 
     def login(self, request_token: str):
@@ -32,9 +31,15 @@ class Trader:
 
     def get_ltp(self, symbol: str) -> float:
         """Get Last Traded Price for a symbol"""
+        return self.get_ltps([symbol]).get(symbol)
+
+    def get_ltps(self, symbols: List[str]) -> Dict[str, float]:
+        """Get Last Traded Prices for many symbols in a single quote request"""
+        if not symbols:
+            return {}
         try:
-            quote = self.kite.quote(f'NSE:{symbol}')
-            return quote[f'NSE:{symbol}']['last_price']
+            quote = self.kite.quote([f'NSE:{s}' for s in symbols])
+            return {s: quote[f'NSE:{s}']['last_price'] for s in symbols if f'NSE:{s}' in quote}
         except Exception as e:
             print(f'Error getting LTP: {str(e)}')
-            return None
\ No newline at end of file
+            return {}
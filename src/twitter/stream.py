@@ -1,17 +1,40 @@
 import tweepy
-import pytz
-from typing import List, Callable, Optional
-from datetime import datetime, timedelta
-import json
+from typing import Dict, Iterable, Iterator, List, Callable, Optional, Tuple
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+import numpy as np
+import orjson
 import os
-from ..config.settings import settings
+import sqlite3
+import tempfile
+import pandas as pd
+from ..config.settings import get_settings
 from ..models.tweet import Tweet
 import logging
+import heapq
+import itertools
+import threading
+import time as time_module
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+IST = ZoneInfo('Asia/Kolkata')
+# India observes no DST, so IST is always UTC+05:30; see TwitterStream._to_ist
+IST_OFFSET = timedelta(hours=5, minutes=30)
+# Most usernames the v2 users/by endpoint resolves per request
+USER_LOOKUP_BATCH = 100
+MAX_FETCH_WORKERS = 8
+SINCE_IDS_FILE = '_since_ids.json'
+TWEET_CACHE_DB = 'tweets.db'
+# Cached days with more tweets than this are streamed from the store, not loaded whole
+CACHE_STREAM_ROWS = 5000
+# Length of a Twitter v2 rate limit window, used when a 429 carries no reset header
+RATE_LIMIT_WINDOW = 15 * 60
+
 class TwitterStream:
-    def __init__(self, api_key: str, api_secret: str, access_token: str, access_token_secret: str, bearer_token: str = None):
+    def __init__(self, api_key: str, api_secret: str, access_token: str, access_token_secret: str, bearer_token: str = None, bearer_tokens: Optional[List[str]] = None):
         logger.debug("Initializing TwitterStream")
         
         if not bearer_token:
@@ -33,16 +56,93 @@ class TwitterStream:
             logger.error(f"Error initializing Twitter API: {str(e)}")
             raise
 
-        self.ist_tz = pytz.timezone('Asia/Kolkata')
+        # App-only clients that read requests rotate across, each with its own rate limit
+        # bucket; a client that hits a 429 cools down until its window resets. This covers
+        # the polled reads (user lookups, backtest fetches and live catch-up polls); the
+        # filtered stream itself connects with the primary bearer token only
+        if bearer_tokens is None:
+            bearer_tokens = get_settings().TWITTER_BEARER_TOKENS
+        self._clients = deque(
+            tweepy.Client(bearer_token=token, wait_on_rate_limit=False)
+            for token in dict.fromkeys([bearer_token, *bearer_tokens])
+        )
+        self._cooldown: List[Tuple[float, int, tweepy.Client]] = []
+        self._pool_lock = threading.Lock()
+
+        self._bearer_token = bearer_token
+        self.ist_tz = IST
         self.cache_dir = 'tweet_cache'
         os.makedirs(self.cache_dir, exist_ok=True)
 
-    def get_users_tweets(self, user_id: str, limit: Optional[int] = None) -> List[dict]:
-        logger.debug(f"Fetching tweets for user_id: {user_id}, limit: {limit}")
+        # All cached tweets live in one SQLite store keyed by (handle, date, id)
+        self._db = self._open_cache_db()
+        self._db_lock = threading.Lock()
+
+        # Loaded tweets by (handle, date): (loaded at, store data_version, tweets)
+        self._mem_cache: Dict[Tuple[str, str], Tuple[float, int, List[dict]]] = {}
+
+        # Newest tweet id delivered live per handle, by a poll or the filtered stream,
+        # so live polls only fetch newer tweets
+        self._since_ids_path = os.path.join(self.cache_dir, SINCE_IDS_FILE)
+        self._since_ids: Dict[str, int] = self._load_since_ids()
+        self._since_ids_lock = threading.Lock()
+
+        # Market-hours windows are fixed by settings, so derive them once
+        settings = get_settings()
+        self._open_start_t, self._open_end_t = self._window(
+            settings.MARKET_OPEN_TIME, settings.MARKET_OPENING_WINDOW
+        )
+        self._close_start_t, self._close_end_t = self._window(
+            settings.MARKET_CLOSE_TIME, settings.MARKET_CLOSING_WINDOW
+        )
+
+    @staticmethod
+    def _window(center: time, minutes: int) -> Tuple[time, time]:
+        """Start and end times of a window of +/- minutes around a time of day"""
+        anchor = datetime.combine(datetime.today(), center)
+        delta = timedelta(minutes=minutes)
+        return (anchor - delta).time(), (anchor + delta).time()
+
+    def _with_client(self, method: str, **kwargs):
+        """Call a Client read method on the next pooled client that isn't rate limited"""
+        while True:
+            with self._pool_lock:
+                now = time_module.time()
+                while self._cooldown and self._cooldown[0][0] <= now:
+                    self._clients.append(heapq.heappop(self._cooldown)[2])
+                client = self._clients.popleft() if self._clients else None
+
+            if client is None:
+                # Every token is exhausted; the primary client waits out the limit
+                logger.info(f"All bearer tokens rate limited, waiting on primary client for {method}")
+                return getattr(self.client, method)(**kwargs)
+
+            try:
+                response = getattr(client, method)(**kwargs)
+            except tweepy.TooManyRequests as e:
+                reset = float(e.response.headers.get('x-rate-limit-reset', time_module.time() + RATE_LIMIT_WINDOW))
+                logger.warning(f"Bearer token rate limited on {method}, cooling down until {reset:.0f}")
+                with self._pool_lock:
+                    heapq.heappush(self._cooldown, (reset, id(client), client))
+                continue
+            except Exception:
+                with self._pool_lock:
+                    self._clients.append(client)
+                raise
+
+            # Round robin: successful clients go to the back of the queue
+            with self._pool_lock:
+                self._clients.append(client)
+            return response
+
+    def get_users_tweets(self, user_id: str, limit: Optional[int] = None, since_id: Optional[int] = None) -> List[dict]:
+        logger.debug("Fetching tweets for user_id: %s, limit: %s, since_id: %s", user_id, limit, since_id)
         try:
-            tweets = self.client.get_users_tweets(
+            tweets = self._with_client(
+                'get_users_tweets',
                 id=user_id,
                 max_results=limit or 100,
+                since_id=since_id,
                 exclude=['retweets', 'replies'],
                 tweet_fields=['created_at', 'public_metrics']
             )
@@ -74,109 +174,411 @@ class TwitterStream:
     def start_stream(self, handles: List[str], callback: Callable[[Tweet], None], is_backtest: bool = False):
         """Start streaming tweets from specified handles"""
         logger.info(f"Starting stream for handles: {handles}, is_backtest: {is_backtest}")
+        settings = get_settings()
         current_time = datetime.now(self.ist_tz)
         
         if not is_backtest and not self.is_market_hours(current_time):
             logger.info("Skipping - Not market hours")
             return
 
+        # Serve what we can from the cache; only the rest needs the API
+        to_fetch = []
         for handle in handles:
-            logger.debug(f"Processing handle: {handle}")
+            logger.debug("Processing handle: %s", handle)
             try:
-                # Try loading from cache first
-                cached_tweets = self.load_from_cache(handle, current_time)
-                
-                if cached_tweets is not None:
-                    logger.info(f"Using cached tweets for {handle}")
-                    for tweet_data in cached_tweets:
-                        tweet_obj = Tweet(
-                            id=tweet_data['id'],
-                            text=tweet_data['text'],
-                            author=handle,
-                            created_at=datetime.fromisoformat(tweet_data['created_at'])
+                # Live polls want only tweets newer than the watermark, never the cache
+                cached_tweets = self.load_from_cache(handle, current_time) if is_backtest else None
+                if cached_tweets is None:
+                    to_fetch.append(handle)
+                    continue
+
+                logger.info(f"Using cached tweets for {handle}")
+                if getattr(callback, 'batch', False):
+                    # At most CACHE_STREAM_ROWS tweets per call, so a day streamed
+                    # from the store is never collected into memory whole
+                    rows = iter(cached_tweets)
+                    while chunk := list(itertools.islice(rows, CACHE_STREAM_ROWS)):
+                        callback(
+                            [str(tweet_data['id']) for tweet_data in chunk],
+                            [tweet_data['text'] for tweet_data in chunk],
+                            [tweet_data['created_at'] for tweet_data in chunk],
+                            [handle] * len(chunk)
                         )
-                        callback(tweet_obj)
                     continue
+                for tweet_data in cached_tweets:
+                    tweet_obj = Tweet.model_validate({**tweet_data, 'author': handle})
+                    callback(tweet_obj)
+            except Exception as e:
+                logger.error(f"Error processing handle {handle}: {str(e)}", exc_info=True)
+
+        if not to_fetch:
+            return
+
+        # Resolve all handles in batched lookups, then fetch timelines concurrently
+        user_ids = self.lookup_user_ids(to_fetch)
+        for handle in to_fetch:
+            if handle not in user_ids:
+                logger.warning(f"User not found: {handle}")
+        found = [handle for handle in to_fetch if handle in user_ids]
+        if not found:
+            return
+
+        tweet_limit = settings.TWEETS_PER_DAY_LIMIT if is_backtest else None
+        # Backtests want the handle's history, so only live polls skip seen tweets
+        since_ids = {} if is_backtest else self._since_ids
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(found))) as executor:
+            results = executor.map(
+                lambda handle: self._process_handle(
+                    handle, user_ids[handle], tweet_limit, since_ids.get(handle), is_backtest, current_time
+                ),
+                found
+            )
 
-                # Get user details
-                logger.debug(f"Fetching user details for {handle}")
-                user = self.client.get_user(username=handle.lstrip('@'))
-                if not user.data:
-                    logger.warning(f"User not found: {handle}")
+            # Callbacks run on the calling thread, in handle order
+            for handle, columns in zip(found, results):
+                if not columns:
                     continue
-                
-                logger.info(f"Found user {handle} with id: {user.data.id}")
-                
-                # Get tweets
-                tweet_limit = settings.TWEETS_PER_DAY_LIMIT if is_backtest else None
-                tweets = self.get_users_tweets(user.data.id, limit=tweet_limit)
-                
-                # Process tweets
-                market_tweets = []
-                for tweet in tweets:
-                    tweet_time = tweet.created_at.astimezone(self.ist_tz)
-                    if is_backtest or self.is_market_hours(tweet_time):
-                        tweet_obj = Tweet(
-                            id=tweet.id,
-                            text=tweet.text,
-                            author=handle,
-                            created_at=tweet_time
-                        )
-                        callback(tweet_obj)
-                        market_tweets.append({
-                            'id': str(tweet.id),
-                            'text': tweet.text,
-                            'created_at': tweet_time.isoformat()
-                        })
-                
-                # Cache tweets
-                if market_tweets:
-                    logger.info(f"Caching {len(market_tweets)} tweets for {handle}")
-                    self.save_to_cache(handle, current_time, market_tweets)
+                try:
+                    self._dispatch(callback, *columns, [handle] * len(columns[0]))
+                except Exception as e:
+                    logger.error(f"Error processing handle {handle}: {str(e)}", exc_info=True)
 
+    def lookup_user_ids(self, handles: List[str]) -> Dict[str, int]:
+        """Map handles to user ids, resolving up to 100 usernames per request"""
+        by_username = {handle.lstrip('@').lower(): handle for handle in handles}
+        usernames = list(by_username)
+        user_ids = {}
+        for start in range(0, len(usernames), USER_LOOKUP_BATCH):
+            batch = usernames[start:start + USER_LOOKUP_BATCH]
+            logger.debug("Fetching user details for %s", batch)
+            try:
+                users = self._with_client('get_users', usernames=batch)
             except Exception as e:
-                logger.error(f"Error processing handle {handle}: {str(e)}", exc_info=True)
+                logger.error(f"Error fetching user details: {str(e)}")
+                continue
+            for user in users.data or []:
+                handle = by_username.get(user.username.lower())
+                if handle is not None:
+                    logger.info(f"Found user {handle} with id: {user.id}")
+                    user_ids[handle] = user.id
+        return user_ids
+
+    @staticmethod
+    def _dispatch(
+        callback: Callable,
+        ids: List[str],
+        texts: List[str],
+        times: List[datetime],
+        authors: List[str]
+    ):
+        """
+        Pass tweets to callback as columns if it accepts batches, else one at a time
+
+        A callback opts into batches by setting a truthy ``batch`` attribute;
+        it is then called as callback(ids, texts, times, authors).
+        """
+        if getattr(callback, 'batch', False):
+            callback(ids, texts, times, authors)
+            return
+        for tweet_id, text, created_at, author in zip(ids, texts, times, authors):
+            callback(Tweet(id=tweet_id, text=text, author=author, created_at=created_at))
+
+    def _process_handle(
+        self,
+        handle: str,
+        user_id: int,
+        limit: Optional[int],
+        since_id: Optional[int],
+        is_backtest: bool,
+        current_time: datetime
+    ) -> Optional[Tuple[List[str], List[str], List[datetime]]]:
+        """
+        Fetch, filter and cache one handle's tweets on a worker thread
+
+        Returns the selected tweets as (ids, texts, times) columns for the
+        caller to dispatch, or None if there is nothing to pass on.
+        """
+        try:
+            tweets = self.get_users_tweets(user_id, limit=limit, since_id=since_id)
+            if not tweets:
+                return None
+            # Only live polls advance the watermark; a backtest's fetch would make
+            # the next live poll skip everything older than the history it pulled
+            if not is_backtest:
+                self._update_since_id(handle, max(int(tweet.id) for tweet in tweets))
+
+            # Convert and filter the whole batch at once rather than per tweet
+            tweet_times = self.to_ist_index([tweet.created_at for tweet in tweets])
+            selected = (
+                np.arange(len(tweets)) if is_backtest
+                # Live polls trade on what they return, so only today's market-hours tweets
+                else np.flatnonzero(
+                    self.market_hours_mask(tweet_times)
+                    & (tweet_times.normalize() == pd.Timestamp(current_time).normalize())
+                )
+            )
+
+            # Buffer the selected tweets as parallel columns
+            ids = [str(tweets[i].id) for i in selected]
+            texts = [tweets[i].text for i in selected]
+            times = [tweet_times[i].to_pydatetime() for i in selected]
+
+            # Cache tweets
+            if ids:
+                logger.info(f"Caching {len(ids)} tweets for {handle}")
+                self.save_to_cache(handle, current_time, (
+                    {'id': tweet_id, 'text': text, 'created_at': created_at}
+                    for tweet_id, text, created_at in zip(ids, texts, times)
+                ))
+            return ids, texts, times
+        except Exception as e:
+            logger.error(f"Error processing handle {handle}: {str(e)}", exc_info=True)
+            return None
+
+    def catch_up(self, handles: List[str], callback: Callable[[Tweet], None]):
+        """
+        Poll for tweets posted since the newest one already delivered live
+
+        Meant for the gaps while the filtered stream is down. Handles with no
+        watermark yet are skipped, so a first run doesn't replay old tweets.
+        """
+        with self._since_ids_lock:
+            seen = [handle for handle in handles if handle in self._since_ids]
+        if seen:
+            self.start_stream(seen, callback)
+
+    def start_filtered_stream(self, handles: List[str], callback: Callable[[Tweet], None]):
+        """
+        Push new market-hours tweets from the handles to callback as they are posted
+
+        Uses the v2 filtered stream instead of polling each handle; blocks
+        until the stream is disconnected.
+        """
+        logger.info(f"Starting filtered stream for handles: {handles}")
+        author_handles = {user_id: handle for handle, user_id in self.lookup_user_ids(handles).items()}
+        if not author_handles:
+            logger.warning(f"No users found for handles: {handles}")
+            return
+        usernames = [handle.lstrip('@') for handle in author_handles.values()]
+
+        stream = HandleStreamingClient(self, author_handles, callback, bearer_token=self._bearer_token)
+
+        # Replace any rules left over from a previous run
+        existing = stream.get_rules()
+        if existing.data:
+            stream.delete_rules([rule.id for rule in existing.data])
+        stream.add_rules([tweepy.StreamRule(f'from:{username}') for username in usernames])
+
+        stream.filter(tweet_fields=['created_at', 'author_id', 'public_metrics'])
+
+    def to_ist_index(self, times: List[datetime]) -> pd.DatetimeIndex:
+        """Convert tz-aware datetimes to an IST DatetimeIndex in one pass"""
+        return pd.DatetimeIndex(times).tz_convert(self.ist_tz)
+
+    def market_hours_mask(self, times: pd.DatetimeIndex) -> np.ndarray:
+        """Vectorized is_market_hours over an IST DatetimeIndex"""
+        mask = np.zeros(len(times), dtype=bool)
+        mask[times.indexer_between_time(self._open_start_t, self._open_end_t)] = True
+        mask[times.indexer_between_time(self._close_start_t, self._close_end_t)] = True
+        return mask
+
+    def _to_ist(self, dt: datetime) -> datetime:
+        """
+        Convert a tz-aware datetime to IST
+
+        UTC times, which is what the API returns, are shifted by the fixed
+        IST_OFFSET instead of going through the zone's utcoffset lookup.
+        Other zones take the general astimezone path, which is also the
+        one to fall back to should IST ever observe DST.
+        """
+        if dt.tzinfo is self.ist_tz:
+            return dt
+        if dt.tzinfo is timezone.utc:
+            return (dt + IST_OFFSET).replace(tzinfo=self.ist_tz)
+        return dt.astimezone(self.ist_tz)
 
     def is_market_hours(self, dt: datetime) -> bool:
-        ist_time = dt.astimezone(self.ist_tz).time()
-        
-        market_open = datetime.combine(dt.date(), settings.MARKET_OPEN_TIME)
-        open_start = market_open - timedelta(minutes=settings.MARKET_OPENING_WINDOW)
-        open_end = market_open + timedelta(minutes=settings.MARKET_OPENING_WINDOW)
-        
-        market_close = datetime.combine(dt.date(), settings.MARKET_CLOSE_TIME)
-        close_start = market_close - timedelta(minutes=settings.MARKET_CLOSING_WINDOW)
-        close_end = market_close + timedelta(minutes=settings.MARKET_CLOSING_WINDOW)
-        
-        is_opening = open_start.time() <= ist_time <= open_end.time()
-        is_closing = close_start.time() <= ist_time <= close_end.time()
-        
-        logger.debug(f"Time: {ist_time}, Is opening: {is_opening}, Is closing: {is_closing}")
+        # Callers usually pass times already converted to IST; don't convert twice
+        dt = self._to_ist(dt)
+        ist_time = dt.time()
+
+        is_opening = self._open_start_t <= ist_time <= self._open_end_t
+        is_closing = self._close_start_t <= ist_time <= self._close_end_t
+
+        # Runs per tweet; skip the logging call entirely unless debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Time: %s, Is opening: %s, Is closing: %s", ist_time, is_opening, is_closing)
         return is_opening or is_closing
 
-    def get_cache_path(self, handle: str, date: datetime) -> str:
-        date_str = date.strftime('%Y-%m-%d')
-        return os.path.join(self.cache_dir, f'{handle}_{date_str}.json')
+    def _load_since_ids(self) -> Dict[str, int]:
+        try:
+            with open(self._since_ids_path, 'rb') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Error loading since ids: {str(e)}")
+            return {}
+
+    def _update_since_id(self, handle: str, tweet_id: int):
+        """Advance the handle's newest seen tweet id and write it through to disk"""
+        # Handles are processed on worker threads; serialize the update and rewrite
+        with self._since_ids_lock:
+            if tweet_id <= self._since_ids.get(handle, 0):
+                return
+            self._since_ids[handle] = tweet_id
+            try:
+                # Swap in a complete file, so a crash mid-write can't truncate it
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(orjson.dumps(self._since_ids))
+                    os.replace(tmp_path, self._since_ids_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except Exception as e:
+                logger.error(f"Error saving since ids: {str(e)}")
+
+    def _open_cache_db(self) -> sqlite3.Connection:
+        """Open the tweet cache store, creating the table on first use"""
+        db = sqlite3.connect(os.path.join(self.cache_dir, TWEET_CACHE_DB), check_same_thread=False)
+        # WAL lets a backtest read the cache while a live run appends to it
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS tweets ('
+            'handle TEXT NOT NULL, date TEXT NOT NULL, id INTEGER NOT NULL, '
+            'text TEXT NOT NULL, created_at INTEGER NOT NULL, '
+            'PRIMARY KEY (handle, date, id)) WITHOUT ROWID'
+        )
+        db.commit()
+        return db
 
-    def save_to_cache(self, handle: str, date: datetime, tweets: List[dict]):
+    def _data_version(self) -> int:
+        """Changes whenever another connection commits to the cache store"""
+        return self._db.execute('PRAGMA data_version').fetchone()[0]
+
+    def save_to_cache(self, handle: str, date: datetime, tweets: Iterable[dict]):
+        settings = get_settings()
         if settings.CACHE_TWEETS:
-            cache_path = self.get_cache_path(handle, date)
+            key = (handle, date.strftime('%Y-%m-%d'))
+            tweets = list(tweets)
+            # Write through to the in-memory copy, so the next load skips the store.
+            # Build a new list: earlier loads may still be iterating the old one
+            entry = self._mem_cache.get(key)
+            cached = entry[2] + tweets if entry is not None else tweets
             try:
-                with open(cache_path, 'w') as f:
-                    json.dump(tweets, f)
-                logger.debug(f"Saved tweets to cache: {cache_path}")
+                # created_at is kept as epoch milliseconds, the precision Twitter reports
+                rows = [
+                    (key[0], key[1], int(tweet['id']), tweet['text'], round(tweet['created_at'].timestamp() * 1000))
+                    for tweet in tweets
+                ]
+                with self._db_lock, self._db:
+                    self._db.executemany('INSERT OR IGNORE INTO tweets VALUES (?, ?, ?, ?, ?)', rows)
+                    version = self._data_version()
+                self._mem_cache[key] = (time_module.monotonic(), version, cached)
+                logger.debug("Saved tweets to cache: %s %s", *key)
             except Exception as e:
+                self._mem_cache.pop(key, None)
                 logger.error(f"Error saving to cache: {str(e)}")
 
-    def load_from_cache(self, handle: str, date: datetime) -> Optional[List[dict]]:
+    def load_from_cache(self, handle: str, date: datetime) -> Optional[Iterable[dict]]:
+        """
+        Cached tweets for the handle on the date, or None on a miss
+
+        Days with more than CACHE_STREAM_ROWS tweets come back as a generator
+        over the store rather than a list, and are not kept in memory.
+        """
+        settings = get_settings()
         if settings.CACHE_TWEETS:
-            cache_path = self.get_cache_path(handle, date)
-            if os.path.exists(cache_path):
-                try:
-                    with open(cache_path, 'r') as f:
-                        tweets = json.load(f)
-                        logger.debug(f"Loaded {len(tweets)} tweets from cache: {cache_path}")
-                        return tweets
-                except Exception as e:
-                    logger.error(f"Error loading from cache: {str(e)}")
-        return None
\ No newline at end of file
+            key = (handle, date.strftime('%Y-%m-%d'))
+            entry = self._mem_cache.get(key)
+            now = time_module.monotonic()
+            if entry is not None and now - entry[0] < settings.CACHE_TTL:
+                return entry[2]
+
+            try:
+                stream = False
+                with self._db_lock:
+                    version = self._data_version()
+                    # Past the TTL, only re-query if another process wrote to the store
+                    if entry is not None and entry[1] == version:
+                        tweets = entry[2]
+                    else:
+                        logger.debug("Loading tweets from cache: %s %s", *key)
+                        count = self._db.execute(
+                            'SELECT COUNT(*) FROM tweets WHERE handle = ? AND date = ?', key
+                        ).fetchone()[0]
+                        stream = count > CACHE_STREAM_ROWS
+                        tweets = [] if stream or not count else [
+                            self._cached_tweet(*row)
+                            for row in self._db.execute(
+                                'SELECT id, text, created_at FROM tweets WHERE handle = ? AND date = ? ORDER BY id',
+                                key
+                            )
+                        ]
+                if stream:
+                    self._mem_cache.pop(key, None)
+                    return self._stream_from_cache(key)
+                # No rows is a cache miss
+                if not tweets:
+                    self._mem_cache.pop(key, None)
+                    return None
+                self._mem_cache[key] = (now, version, tweets)
+                return tweets
+            except Exception as e:
+                logger.error(f"Error loading from cache: {str(e)}")
+        return None
+
+    def _cached_tweet(self, tweet_id: int, text: str, created_ms: int) -> dict:
+        return {'id': str(tweet_id), 'text': text, 'created_at': datetime.fromtimestamp(created_ms / 1000, self.ist_tz)}
+
+    def _stream_from_cache(self, key: Tuple[str, str]) -> Iterator[dict]:
+        """Yield a large cached day row by row from its own connection"""
+        # A separate reader (WAL allows it) so callbacks run without holding the store lock
+        db = sqlite3.connect(os.path.join(self.cache_dir, TWEET_CACHE_DB))
+        try:
+            for row in db.execute(
+                'SELECT id, text, created_at FROM tweets WHERE handle = ? AND date = ? ORDER BY id',
+                key
+            ):
+                yield self._cached_tweet(*row)
+        finally:
+            db.close()
+
+
+class HandleStreamingClient(tweepy.StreamingClient):
+    """Filtered-stream client that forwards tweets from known authors as Tweet models"""
+
+    def __init__(self, twitter_stream: TwitterStream, author_handles: Dict[int, str], callback: Callable[[Tweet], None], **kwargs):
+        super().__init__(wait_on_rate_limit=True, **kwargs)
+        self._twitter_stream = twitter_stream
+        self._author_handles = author_handles
+        self._callback = callback
+
+    def on_tweet(self, tweet):
+        handle = self._author_handles.get(tweet.author_id)
+        if handle is None:
+            return
+        # Tweets the stream delivered are seen; a later live poll starts after them
+        self._twitter_stream._update_since_id(handle, tweet.id)
+
+        tweet_time = self._twitter_stream._to_ist(tweet.created_at)
+        if not self._twitter_stream.is_market_hours(tweet_time):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Skipping tweet %s outside market hours", tweet.id)
+            return
+
+        self._callback(Tweet(
+            id=str(tweet.id),
+            text=tweet.text,
+            author=handle,
+            created_at=tweet_time
+        ))
+
+    def on_errors(self, errors):
+        logger.error(f"Filtered stream errors: {errors}")
+
+    def on_exception(self, exception):
+        logger.error(f"Filtered stream exception: {str(exception)}", exc_info=True)
@@ -1,113 +1,341 @@
+import operator
+import os
 import re
-from typing import List, Set
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+import numpy as np
 import pandas as pd
 from ..trading.historical_data import HistoricalDataFetcher
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on the environment
+    ahocorasick = None
+
+try:
+    import marisa_trie
+except ImportError:  # pragma: no cover - depends on the environment
+    marisa_trie = None
+
+NSE_SYMBOLS_FILE = 'nse_symbols.marisa'
+# The instrument list changes with listings and expiries; refetch it daily
+NSE_SYMBOLS_TTL = 24 * 3600
+# Most texts whose analyze_symbols results an extractor keeps
+ANALYZE_CACHE_SIZE = 8192
+
+# One pass over the text: URLs, mentions and hashtags (dropped) or punctuation (blanked)
+_CLEAN_PATTERN = re.compile(r'(?P<drop>http\S+|www\S+|@\w+|#\w+)|[^\w\s$:]')
+
+def _clean_replacement(match: re.Match) -> str:
+    return '' if match.lastgroup == 'drop' else ' '
+
+# Joins batch rows; two newlines so a match consuming one still leaves the next row a boundary
+ROW_SEPARATOR = '\n\n'
+
+# Symbols the standalone-word scan can match, as the regex it replaces allowed
+_STANDALONE_SYMBOL = re.compile(r'[A-Z0-9]{2,}')
+
+# One extracted symbol and its confidence, as returned by analyze_symbols
+SymbolScore = namedtuple('SymbolScore', 'symbol confidence')
+
+_by_confidence = operator.itemgetter(1)
+
+def _standalone_signals(text: str) -> Iterator[Tuple[str, str]]:
+    """Standalone-word signals without the automaton: every word shaped like a symbol"""
+    # Words are split out rather than matched in the alternation, where a word
+    # also taken by the suffix alternative would never be seen as standalone
+    for word in text.split():
+        if _STANDALONE_SYMBOL.fullmatch(word):
+            yield 'plain', sys.intern(word)
+
 class SymbolExtractor:
     def __init__(self, historical_data: HistoricalDataFetcher):
         self.historical_data = historical_data
         self._nse_symbols = self._load_nse_symbols()
-        self._symbol_patterns = self._compile_patterns()
+        self._automaton = self._build_automaton(self._nse_symbols)
+        # analyze_symbols results by raw text, least recently used first
+        self._scores: Dict[str, Tuple[SymbolScore, ...]] = {}
+        self._symbol_pattern = self._compile_pattern()
+        self._prefix_pattern = self._compile_pattern(with_suffixes=False)
+
+    def _load_nse_symbols(self) -> FrozenSet[str]:
+        """
+        Load all NSE symbols, interned for fast membership tests
+
+        Symbols are kept in an on-disk marisa-trie next to the market data
+        cache and refetched from Zerodha once the file is a day old.
+        """
+        cache_path = os.path.join(self.historical_data.cache_dir, NSE_SYMBOLS_FILE)
+        if marisa_trie is not None:
+            try:
+                if time.time() - os.path.getmtime(cache_path) < NSE_SYMBOLS_TTL:
+                    trie = marisa_trie.Trie()
+                    trie.mmap(cache_path)
+                    return frozenset(sys.intern(symbol) for symbol in trie)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error reading NSE symbols cache: {str(e)}")
 
-    def _load_nse_symbols(self) -> Set[str]:
-        """Load all NSE symbols from Zerodha"""
         try:
-            instruments = self.historical_data.kite.instruments("NSE")
-            return {instrument['tradingsymbol'] for instrument in instruments}
+            instruments = self.historical_data.get_instruments("NSE")
+            symbols = frozenset(sys.intern(instrument['tradingsymbol']) for instrument in instruments)
         except Exception as e:
             print(f"Error loading NSE symbols: {str(e)}")
-            return set()
+            return frozenset()
 
-    def _compile_patterns(self) -> List[re.Pattern]:
-        """Compile regex patterns for symbol extraction"""
+        if marisa_trie is not None and symbols:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                # Pool workers may all miss at once; save under a unique temp name and
+                # swap it in, so no reader ever mmaps a half-written trie
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+                os.close(fd)
+                try:
+                    marisa_trie.Trie(symbols).save(tmp_path)
+                    os.replace(tmp_path, cache_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except Exception as e:
+                print(f"Error writing NSE symbols cache: {str(e)}")
+        return symbols
+
+    @staticmethod
+    def _build_automaton(symbols: FrozenSet[str]):
+        """
+        Aho-Corasick automaton over the NSE symbols for the standalone-word scan
+
+        Returns None when pyahocorasick isn't installed (or there are no
+        symbols), in which case every whitespace-separated word is checked.
+        """
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for symbol in symbols:
+            if _STANDALONE_SYMBOL.fullmatch(symbol):
+                # Store the match length and the finished signal, so the scan allocates nothing
+                automaton.add_word(symbol, (len(symbol), ('plain', symbol)))
+        if len(automaton) == 0:
+            return None
+        automaton.make_automaton()
+        return automaton
+
+    def _compile_pattern(self, with_suffixes: bool = True) -> re.Pattern:
+        """
+        Compile the symbol patterns into one alternation
+
+        The named group that matched records which pattern found the symbol.
+        Without suffixes, the -EQ/NSE/BSE alternative is left out. The
+        trailing boundary is a lookahead, so a match never consumes the
+        whitespace the next word's match starts from.
+        """
         patterns = [
             # Match $SYMBOL format
-            re.compile(r'\$([A-Z0-9]+)'),
+            r'\$(?P<cash>[A-Z0-9]+)',
             # Match NSE:SYMBOL format
-            re.compile(r'NSE:([A-Z0-9]+)'),
+            r'NSE:(?P<nse>[A-Z0-9]+)'
+        ]
+        if with_suffixes:
             # Match common Indian stock variations
-            re.compile(r'(?:^|\s)([A-Z0-9]+)-?(?:EQ|NSE|BSE)(?:\s|$)'),
-            # Match standalone uppercase words that match NSE symbols
-            re.compile(r'(?:^|\s)([A-Z0-9]{2,})(?:\s|$)')
+            patterns.append(r'(?:^|\s)(?P<eq>[A-Z0-9]+)-?(?:EQ|NSE|BSE)(?=\s|$)')
+        return re.compile('|'.join(patterns))
+
+    def _find_signals(self, text: str) -> Set[Tuple[str, str]]:
+        """(pattern kind, symbol) pairs found in text, from a single regex pass"""
+        # The suffix alternative is the costly one (it is tried and backtracked at
+        # every word), so skip it when no 'EQ'/'NSE'/'BSE' can occur in the text
+        pattern = self._symbol_pattern if 'EQ' in text or 'SE' in text else self._prefix_pattern
+
+        # Interned matches compare by identity against the interned symbol set
+        signals = {
+            (match.lastgroup, sys.intern(match.group(match.lastgroup)))
+            for match in pattern.finditer(text)
+        }
+
+        # Standalone words: one automaton pass yields only real symbols. Padding
+        # with spaces makes the text edges ordinary word boundaries.
+        if self._automaton is not None:
+            padded = f' {text} '
+            isspace = str.isspace
+            add = signals.add
+            for end, (length, signal) in self._automaton.iter(padded):
+                if isspace(padded[end - length]) and isspace(padded[end + 1]):
+                    add(signal)
+        else:
+            signals.update(_standalone_signals(text))
+        return signals
+
+    def _find_signals_batch(self, texts: List[str]) -> List[Set[Tuple[str, str]]]:
+        """
+        _find_signals for many texts with one regex and one automaton pass
+
+        The texts are joined with blank-line separators. A pattern's leading
+        or trailing whitespace can consume at most one of the two newlines,
+        so each row still sees its own start and end boundaries. Matches are
+        mapped back to rows by binary search on the row offsets.
+        """
+        signals = [set() for _ in texts]
+        if not texts:
+            return signals
+        joined = ROW_SEPARATOR.join(texts)
+        starts = np.cumsum([0] + [len(text) + len(ROW_SEPARATOR) for text in texts[:-1]])
+
+        pattern = self._symbol_pattern if 'EQ' in joined or 'SE' in joined else self._prefix_pattern
+        matches = [
+            (match.start(match.lastgroup), match.lastgroup, sys.intern(match.group(match.lastgroup)))
+            for match in pattern.finditer(joined)
         ]
-        return patterns
+        if matches:
+            rows = np.searchsorted(starts, [position for position, _, _ in matches], side='right') - 1
+            for row, (_, kind, symbol) in zip(rows.tolist(), matches):
+                signals[row].add((kind, symbol))
+
+        if self._automaton is not None:
+            padded = f' {joined} '
+            isspace = str.isspace
+            found = [
+                (end - length, signal)
+                for end, (length, signal) in self._automaton.iter(padded)
+                if isspace(padded[end - length]) and isspace(padded[end + 1])
+            ]
+            if found:
+                # end - length is the match start in unpadded (joined) coordinates
+                rows = np.searchsorted(starts, [position for position, _ in found], side='right') - 1
+                for row, (_, signal) in zip(rows.tolist(), found):
+                    signals[row].add(signal)
+        else:
+            for row_signals, text in zip(signals, texts):
+                row_signals.update(_standalone_signals(text))
+        return signals
 
     def extract_symbols(self, text: str) -> List[str]:
         """
         Extract potential stock symbols from tweet text
         Returns list of valid NSE symbols
         """
-        potential_symbols = set()
-        
-        # Extract using all patterns
-        for pattern in self._symbol_patterns:
-            matches = pattern.findall(text)
-            potential_symbols.update(matches)
-        
         # Filter to only valid NSE symbols
-        valid_symbols = [
-            symbol for symbol in potential_symbols 
+        return list({
+            symbol for _, symbol in self._find_signals(text)
             if symbol in self._nse_symbols
+        })
+
+    def extract_symbols_batch(self, texts: List[str]) -> List[List[str]]:
+        """extract_symbols for a batch of texts, scanned in one pass"""
+        return [
+            list({symbol for _, symbol in signals if symbol in self._nse_symbols})
+            for signals in self._find_signals_batch(texts)
         ]
-        
-        return valid_symbols
 
     def _clean_text(self, text: str) -> str:
         """Clean text for better symbol extraction"""
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        # Remove mentions
-        text = re.sub(r'@\w+', '', text)
-        # Remove hashtags
-        text = re.sub(r'#\w+', '', text)
-        # Remove punctuation except $ and :
-        text = re.sub(r'[^\w\s$:]', ' ', text)
-        return text.strip()
-
-    def analyze_symbols(self, text: str) -> List[dict]:
+        # Remove URLs, mentions and hashtags, and blank out punctuation except $ and :
+        return _CLEAN_PATTERN.sub(_clean_replacement, text).strip()
+
+    def analyze_symbols(self, text: str) -> Tuple[SymbolScore, ...]:
         """
         Analyze text and return detailed information about extracted symbols
-        Returns list of dicts with symbol and confidence score
+        Returns (symbol, confidence) SymbolScores, highest confidence first
+
+        Results are memoized per text, since retweets and repeats are common.
         """
-        cleaned_text = self._clean_text(text)
-        symbols = self.extract_symbols(cleaned_text)
-        
-        results = []
-        for symbol in symbols:
-            confidence = self._calculate_confidence(symbol, cleaned_text)
-            results.append({
-                'symbol': symbol,
-                'confidence': confidence
-            })
-        
+        scores = self._recall_scores(text)
+        if scores is None:
+            cleaned_text = self._clean_text(text)
+            scores = self._score_symbols(cleaned_text, self._find_signals(cleaned_text))
+            self._remember_scores(text, scores)
+        return scores
+
+    def analyze_symbols_batch(self, texts: List[str]) -> List[Tuple[SymbolScore, ...]]:
+        """
+        analyze_symbols for a batch of texts
+
+        Texts already memoized are served from the cache; each other distinct
+        text is cleaned once and all of them are scanned together.
+        """
+        results = {}
+        unseen = []
+        for text in dict.fromkeys(texts):
+            scores = self._recall_scores(text)
+            if scores is None:
+                unseen.append(text)
+            else:
+                results[text] = scores
+        cleaned = [self._clean_text(text) for text in unseen]
+        for text, cleaned_text, signals in zip(unseen, cleaned, self._find_signals_batch(cleaned)):
+            results[text] = self._score_symbols(cleaned_text, signals)
+            self._remember_scores(text, results[text])
+        return [results[text] for text in texts]
+
+    def _recall_scores(self, text: str) -> Optional[Tuple[SymbolScore, ...]]:
+        """Memoized scores for a text, marking them most recently used"""
+        scores = self._scores.pop(text, None)
+        if scores is not None:
+            self._scores[text] = scores
+        return scores
+
+    def _remember_scores(self, text: str, scores: Tuple[SymbolScore, ...]):
+        """Memoize a text's scores, evicting the least recently used entry once the cache is full"""
+        if len(self._scores) >= ANALYZE_CACHE_SIZE:
+            self._scores.pop(next(iter(self._scores)), None)
+        self._scores[text] = scores
+
+    def _score_symbols(self, cleaned_text: str, signals: Set[Tuple[str, str]]) -> Tuple[SymbolScore, ...]:
+        """Confidence-sorted symbol info for a cleaned text and its signals"""
+        symbols = {symbol for _, symbol in signals if symbol in self._nse_symbols}
+        if not symbols:
+            return ()
+
+        # Per-text work done once: the words (for the standalone check) and keywords
+        words = frozenset(cleaned_text.split())
+        text_lower = cleaned_text.lower()
+        has_trade_words = 'buy' in text_lower or 'sell' in text_lower
+        has_level_words = 'target' in text_lower or 'stop' in text_lower
+
+        results = [
+            SymbolScore(symbol, self._calculate_confidence(symbol, cleaned_text, words, has_trade_words, has_level_words))
+            for symbol in symbols
+        ]
+
         # Sort by confidence
-        return sorted(results, key=lambda x: x['confidence'], reverse=True)
+        return tuple(sorted(results, key=_by_confidence, reverse=True))
 
-    def _calculate_confidence(self, symbol: str, text: str) -> float:
+    @staticmethod
+    def _calculate_confidence(
+        symbol: str,
+        text: str,
+        words: FrozenSet[str],
+        has_trade_words: bool,
+        has_level_words: bool
+    ) -> float:
         """Calculate confidence score for symbol extraction"""
         confidence = 0.0
-        
+
         # Check for exact cashtag match ($SYMBOL)
         if f'${symbol}' in text:
             confidence += 0.4
-        
+
         # Check for NSE:SYMBOL format
         if f'NSE:{symbol}' in text:
             confidence += 0.4
-            
+
         # Check for symbol with -EQ suffix
         if f'{symbol}-EQ' in text:
             confidence += 0.3
-            
-        # Check for standalone symbol
-        if re.search(f'(?:^|\s){symbol}(?:\s|$)', text):
+
+        # Check for standalone symbol; a whitespace-separated word, as the
+        # (?:^|\s)SYMBOL(?:\s|$) search it replaces matched
+        if symbol in words:
             confidence += 0.2
-            
+
         # Additional context-based scoring
-        if 'buy' in text.lower() or 'sell' in text.lower():
+        if has_trade_words:
             confidence += 0.1
-            
-        if 'target' in text.lower() or 'stop' in text.lower():
+
+        if has_level_words:
             confidence += 0.1
-            
-        return min(confidence, 1.0)  # Cap at 1.0
\ No newline at end of file
+
+        return min(confidence, 1.0)  # Cap at 1.0
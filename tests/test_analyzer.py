@@ -0,0 +1,46 @@
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.sentiment import analyzer
+from src.sentiment.analyzer import SentimentAnalyzer
+
+@pytest.fixture
+def sentiment_analyzer(monkeypatch, tmp_path):
+    # Thresholds are all that's under test; stand in for the model so nothing is downloaded
+    monkeypatch.setattr(analyzer.get_settings(), 'SENTIMENT_ONNX_DIR', str(tmp_path))
+    monkeypatch.setitem(sys.modules, 'torch', SimpleNamespace(cuda=SimpleNamespace(is_available=lambda: False)))
+    monkeypatch.setitem(sys.modules, 'transformers', SimpleNamespace(pipeline=lambda *args, **kwargs: None))
+    return SentimentAnalyzer()
+
+def baseline_category(score: float) -> str:
+    """The original if/elif chain over the default thresholds"""
+    if score >= 0.8:
+        return 'SUPER_POSITIVE'
+    elif score >= 0.6:
+        return 'POSITIVE'
+    elif score <= 0.2:
+        return 'SUPER_NEGATIVE'
+    elif score <= 0.4:
+        return 'NEGATIVE'
+    return 'NEUTRAL'
+
+@pytest.mark.parametrize('score, expected', [
+    (0.0, 'SUPER_NEGATIVE'),
+    (0.2, 'SUPER_NEGATIVE'),
+    (0.2000001, 'NEGATIVE'),
+    (0.4, 'NEGATIVE'),
+    (0.5, 'NEUTRAL'),
+    (0.6, 'POSITIVE'),
+    (0.7999999, 'POSITIVE'),
+    (0.8, 'SUPER_POSITIVE'),
+    (1.0, 'SUPER_POSITIVE'),
+])
+def test_categorize_at_thresholds(sentiment_analyzer, score, expected):
+    assert sentiment_analyzer._categorize(np.array([score])) == [expected]
+
+def test_categorize_matches_baseline(sentiment_analyzer):
+    scores = np.round(np.linspace(0, 1, 101), 2)
+    assert sentiment_analyzer._categorize(scores) == [baseline_category(score) for score in scores]
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.backtesting import backtest
+from src.backtesting.backtest import Backtester
+
+# 10:00 IST on 2024-01-02 as UTC nanoseconds, between the opening and closing windows
+MIDDAY_NS = 1_704_169_800_000_000_000
+
+@pytest.fixture
+def backtester(monkeypatch):
+    # Metrics don't touch the model, extractor or Twitter client
+    for component in ('SymbolExtractor', 'SentimentAnalyzer', 'TwitterStream'):
+        monkeypatch.setattr(backtest, component, lambda *args, **kwargs: None)
+    return Backtester('2024-01-01', '2024-01-31', historical_data=object())
+
+def test_performance_metrics_match_a_final_pass(backtester):
+    pnls = [120.0, -40.0, 15.5, -80.0, -10.0, 200.0, -5.0]
+    for i, pnl in enumerate(pnls):
+        backtester._record_trade('TCS' if i % 2 else 'INFY', pnl, MIDDAY_NS)
+    backtester.calculate_performance()
+    metrics = backtester.performance_metrics
+
+    pnl = np.array(pnls)
+    equity = np.cumsum(pnl)
+    assert metrics['total_trades'] == len(pnls)
+    assert metrics['profitable_trades'] == 3
+    assert metrics['total_pnl'] == pytest.approx(pnl.sum())
+    assert metrics['avg_trade_pnl'] == pytest.approx(pnl.mean())
+    assert metrics['sharpe_ratio'] == pytest.approx(pnl.mean() / pnl.std())
+    assert metrics['profit_factor'] == pytest.approx(pnl[pnl > 0].sum() / -pnl[pnl <= 0].sum())
+    assert metrics['max_drawdown'] == pytest.approx((equity - np.maximum.accumulate(np.maximum(equity, 0))).min())
+    assert backtester.symbol_metrics['TCS']['total_trades'] == 3
+
+def test_profit_factor_without_losses(backtester):
+    backtester._record_trade('TCS', 50.0, MIDDAY_NS)
+    backtester.calculate_performance()
+    assert backtester.performance_metrics['profit_factor'] == float('inf')
+    assert backtester.performance_metrics['max_drawdown'] == 0.0
+    assert backtester.performance_metrics['sharpe_ratio'] == 0.0
+
+def test_performance_without_trades(backtester):
+    backtester.calculate_performance()
+    assert backtester.performance_metrics['profit_factor'] == 0.0
+    assert backtester.performance_metrics['win_rate'] == 0.0
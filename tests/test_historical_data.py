@@ -0,0 +1,68 @@
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from src.trading.historical_data import HistoricalDataFetcher
+
+def minute_bars(day: str) -> pd.DataFrame:
+    index = pd.date_range(f'{day} 09:15', f'{day} 15:30', freq='min', tz='Asia/Kolkata', name='date')
+    close = pd.Series(range(len(index)), index=index, dtype=float)
+    return pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 100})
+
+@pytest.fixture
+def fetcher(tmp_path):
+    return HistoricalDataFetcher('key', 'secret', cache_dir=str(tmp_path))
+
+def test_opening_closing_data_splits_windows(fetcher, monkeypatch):
+    monkeypatch.setattr(fetcher, 'get_historical_data', lambda *args, **kwargs: minute_bars('2024-01-02'))
+    data = fetcher.get_opening_closing_data('TCS', datetime(2024, 1, 2), window_minutes=30)
+    opening, closing = data['opening'], data['closing']
+    # 09:15-09:45 and 15:00-15:30, both ends inclusive
+    assert len(opening) == 31 and len(closing) == 31
+    assert opening.index[0] == pd.Timestamp('2024-01-02 09:15', tz='Asia/Kolkata')
+    assert closing.index[-1] == pd.Timestamp('2024-01-02 15:30', tz='Asia/Kolkata')
+    assert list(opening.columns) == ['open', 'high', 'low', 'close']
+
+def test_opening_closing_data_without_bars(fetcher, monkeypatch):
+    monkeypatch.setattr(fetcher, 'get_historical_data', lambda *args, **kwargs: None)
+    data = fetcher.get_opening_closing_data('TCS', datetime(2024, 1, 2))
+    assert data['opening'].empty and data['closing'].empty
+
+def test_cache_serves_covered_ranges(fetcher):
+    df = minute_bars('2024-01-02')
+    fetcher._write_cache('TCS', 'minute', datetime(2024, 1, 2), datetime(2024, 1, 3), df)
+    cached = fetcher._read_cache('TCS', 'minute', datetime(2024, 1, 2, 10), datetime(2024, 1, 2, 11))
+    pd.testing.assert_frame_equal(cached, df.loc['2024-01-02 10:00':'2024-01-02 11:00'], check_freq=False)
+    # Not covered by any fetched range
+    assert fetcher._read_cache('TCS', 'minute', datetime(2024, 1, 2), datetime(2024, 1, 4)) is None
+    assert fetcher._read_cache('INFY', 'minute', datetime(2024, 1, 2), datetime(2024, 1, 3)) is None
+
+def test_cache_index_keeps_each_range(fetcher):
+    first, second = datetime(2024, 1, 2), datetime(2024, 1, 3)
+    fetcher._write_cache('TCS', 'minute', first, first + timedelta(days=1), minute_bars('2024-01-02'))
+    fetcher._write_cache('TCS', 'minute', second, second + timedelta(days=1), minute_bars('2024-01-03'))
+    _, index_path = fetcher._cache_paths('TCS', 'minute')
+    assert [entry[:2] for entry in fetcher._read_coverage(index_path)] == [
+        [first.isoformat(), second.isoformat()],
+        [second.isoformat(), (second + timedelta(days=1)).isoformat()]
+    ]
+    assert fetcher._read_cache('TCS', 'minute', first, second) is not None
+    assert fetcher._read_cache('TCS', 'minute', second, second + timedelta(days=1)) is not None
+
+def test_cache_refetches_missing_parts(fetcher):
+    first, second = datetime(2024, 1, 2), datetime(2024, 1, 3)
+    fetcher._write_cache('TCS', 'minute', first, second, minute_bars('2024-01-02'))
+    part_dir, index_path = fetcher._cache_paths('TCS', 'minute')
+    lost = fetcher._read_coverage(index_path)[0][2]
+    os.remove(os.path.join(part_dir, lost))
+    assert fetcher._read_cache('TCS', 'minute', first, second) is None
+    # The next write drops the range whose part is gone
+    fetcher._write_cache('TCS', 'minute', second, second + timedelta(days=1), minute_bars('2024-01-03'))
+    assert lost not in [entry[2] for entry in fetcher._read_coverage(index_path)]
+
+def test_cache_treats_an_empty_slice_as_a_miss(fetcher):
+    fetcher._write_cache('TCS', 'minute', datetime(2024, 1, 2), datetime(2024, 1, 3), minute_bars('2024-01-02'))
+    # Covered by the index, but the part has no bars this late
+    assert fetcher._read_cache('TCS', 'minute', datetime(2024, 1, 2, 18), datetime(2024, 1, 2, 20)) is None
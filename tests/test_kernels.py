@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from src.backtesting._kernels import _simulate_trade_kernel
+
+def bars(open_, high, low, close):
+    n = len(open_)
+    return (
+        np.array(open_, dtype=np.float64),
+        np.array(high, dtype=np.float64),
+        np.array(low, dtype=np.float64),
+        np.array(close, dtype=np.float64),
+        np.arange(n, dtype=np.int64) * 60
+    )
+
+def simulate(prices, entry_ts_ns=-1, trade_amount=1000.0, sl_pct=2.0, tg_pct=4.0):
+    return _simulate_trade_kernel(*prices, entry_ts_ns, trade_amount, sl_pct, tg_pct)
+
+def test_no_trade_when_entry_is_the_last_bar():
+    prices = bars([100, 100, 100], [101, 101, 101], [99, 99, 99], [100, 100, 100])
+    # The first bar after ts 60 is the last one, with nothing left to exit on
+    assert simulate(prices, entry_ts_ns=60) == (-1, -1, 0.0, 0.0, 0, 0.0)
+    assert simulate(prices, entry_ts_ns=120)[0] == -1
+
+def test_stop_loss_wins_when_a_bar_hits_both_levels():
+    prices = bars([100, 100, 100], [101, 110, 101], [99, 90, 99], [100, 100, 100])
+    entry_i, exit_i, entry_price, exit_price, qty, pnl = simulate(prices)
+    assert (entry_i, exit_i, entry_price, qty) == (0, 1, 100.0, 10)
+    assert exit_price == pytest.approx(98.0)
+    assert pnl == pytest.approx(-20.0)
+
+def test_target_exit():
+    prices = bars([100, 100, 100], [101, 105, 101], [99, 99, 99], [100, 100, 100])
+    _, exit_i, _, exit_price, _, pnl = simulate(prices)
+    assert exit_i == 1
+    assert exit_price == pytest.approx(104.0)
+    assert pnl == pytest.approx(40.0)
+
+def test_exit_falls_back_to_the_last_close():
+    prices = bars([100, 100, 100, 100], [101, 101, 101, 101], [99, 99, 99, 99], [100, 100, 100, 101.5])
+    _, exit_i, _, exit_price, qty, pnl = simulate(prices)
+    assert (exit_i, exit_price, qty) == (3, 101.5, 10)
+    assert pnl == pytest.approx(15.0)
+
+def test_no_trade_when_the_price_exceeds_trade_amount():
+    prices = bars([2000, 2000, 2000], [2001, 2001, 2001], [1999, 1999, 1999], [2000, 2000, 2000])
+    entry_i, _, _, _, qty, pnl = simulate(prices, trade_amount=1000.0)
+    assert (entry_i, qty, pnl) == (-1, 0, 0.0)
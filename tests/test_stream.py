@@ -0,0 +1,64 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.twitter import stream
+from src.twitter.stream import IST, TWEET_CACHE_DB, TwitterStream
+
+DAY = datetime(2024, 1, 2, tzinfo=IST)
+
+def tweet(tweet_id: int, minute: int) -> dict:
+    return {'id': str(tweet_id), 'text': f'tweet {tweet_id}', 'created_at': DAY + timedelta(hours=9, minutes=15 + minute)}
+
+@pytest.fixture
+def twitter_stream(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    return TwitterStream('key', 'secret', 'token', 'token_secret', bearer_token='bearer', bearer_tokens=[])
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(stream.time_module, 'monotonic', lambda: now[0])
+    return now
+
+def write_from_another_process(twitter_stream, *tweets):
+    db = sqlite3.connect(f'{twitter_stream.cache_dir}/{TWEET_CACHE_DB}')
+    with db:
+        db.executemany(
+            'INSERT INTO tweets VALUES (?, ?, ?, ?, ?)',
+            [('alice', '2024-01-02', int(t['id']), t['text'], round(t['created_at'].timestamp() * 1000)) for t in tweets]
+        )
+    db.close()
+
+def test_cache_round_trip(twitter_stream):
+    assert twitter_stream.load_from_cache('alice', DAY) is None
+    twitter_stream.save_to_cache('alice', DAY, [tweet(1, 0), tweet(2, 1)])
+    loaded = twitter_stream.load_from_cache('alice', DAY)
+    assert [t['id'] for t in loaded] == ['1', '2']
+    assert loaded[1]['created_at'] == tweet(2, 1)['created_at']
+
+def test_cache_serves_memory_within_ttl(twitter_stream, clock):
+    twitter_stream.save_to_cache('alice', DAY, [tweet(1, 0)])
+    write_from_another_process(twitter_stream, tweet(2, 1))
+    # Within the TTL the store isn't consulted, even though it changed
+    assert [t['id'] for t in twitter_stream.load_from_cache('alice', DAY)] == ['1']
+
+def test_cache_reloads_after_ttl_when_the_store_changed(twitter_stream, clock):
+    twitter_stream.save_to_cache('alice', DAY, [tweet(1, 0)])
+    first = twitter_stream.load_from_cache('alice', DAY)
+    clock[0] += stream.get_settings().CACHE_TTL
+    # Past the TTL but unchanged: the same list is kept
+    assert twitter_stream.load_from_cache('alice', DAY) is first
+
+    write_from_another_process(twitter_stream, tweet(2, 1))
+    clock[0] += stream.get_settings().CACHE_TTL
+    assert [t['id'] for t in twitter_stream.load_from_cache('alice', DAY)] == ['1', '2']
+
+def test_large_days_are_streamed(twitter_stream, monkeypatch):
+    monkeypatch.setattr(stream, 'CACHE_STREAM_ROWS', 2)
+    twitter_stream.save_to_cache('alice', DAY, [tweet(i, i) for i in range(1, 4)])
+    twitter_stream._mem_cache.clear()
+    loaded = twitter_stream.load_from_cache('alice', DAY)
+    assert not isinstance(loaded, list)
+    assert [t['id'] for t in loaded] == ['1', '2', '3']
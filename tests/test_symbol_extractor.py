@@ -0,0 +1,145 @@
+import gc
+import re
+import weakref
+
+import pytest
+
+from src.twitter import symbol_extractor
+from src.twitter.symbol_extractor import SymbolExtractor
+
+NSE_SYMBOLS = ['TCS', 'INFY', 'RELIANCE', 'SBIN']
+
+# The separate patterns extraction ran before they were fused into one alternation
+BASELINE_PATTERNS = [
+    re.compile(r'\$([A-Z0-9]+)'),
+    re.compile(r'NSE:([A-Z0-9]+)'),
+    re.compile(r'(?:^|\s)([A-Z0-9]+)-?(?:EQ|NSE|BSE)(?:\s|$)'),
+    re.compile(r'(?:^|\s)([A-Z0-9]{2,})(?:\s|$)'),
+]
+
+TEXTS = [
+    'BUY TCSEQ',
+    '$TCS TCSEQ',
+    'go TCSBSE buy',
+    'X TCSNSE y',
+    'NSE:INFY target 1500',
+    '$RELIANCE looks strong',
+    'TCS',
+    'SBIN-EQ breakout',
+    'nothing to see here',
+]
+
+class StubHistoricalData:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def get_instruments(self, exchange):
+        return [{'tradingsymbol': symbol} for symbol in NSE_SYMBOLS]
+
+def baseline_extract(text):
+    found = set()
+    for pattern in BASELINE_PATTERNS:
+        found.update(pattern.findall(text))
+    return found & set(NSE_SYMBOLS)
+
+def baseline_confidence(symbol, text):
+    """Confidence rules as originally written, for a cleaned text"""
+    confidence = 0.0
+    if f'${symbol}' in text:
+        confidence += 0.4
+    if f'NSE:{symbol}' in text:
+        confidence += 0.4
+    if f'{symbol}-EQ' in text:
+        confidence += 0.3
+    if re.search(f'(?:^|\\s){symbol}(?:\\s|$)', text):
+        confidence += 0.2
+    if 'buy' in text.lower() or 'sell' in text.lower():
+        confidence += 0.1
+    if 'target' in text.lower() or 'stop' in text.lower():
+        confidence += 0.1
+    return min(confidence, 1.0)
+
+@pytest.fixture
+def fallback_extractor(tmp_path, monkeypatch):
+    """Extractor on the regex-only path used when pyahocorasick is missing"""
+    monkeypatch.setattr(symbol_extractor, 'ahocorasick', None)
+    extractor = SymbolExtractor(StubHistoricalData(str(tmp_path)))
+    assert extractor._automaton is None
+    return extractor
+
+@pytest.fixture
+def automaton_extractor(tmp_path):
+    if symbol_extractor.ahocorasick is None:
+        pytest.skip('pyahocorasick not installed')
+    return SymbolExtractor(StubHistoricalData(str(tmp_path)))
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_fallback_matches_baseline(fallback_extractor, text):
+    assert set(fallback_extractor.extract_symbols(text)) == baseline_extract(text)
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_fallback_batch_matches_single(fallback_extractor, text):
+    assert set(fallback_extractor.extract_symbols_batch([text, 'BUY TCS INFY'])[0]) == set(fallback_extractor.extract_symbols(text))
+
+def test_fallback_keeps_words_after_a_match(fallback_extractor):
+    # Each word's leading space must survive the previous word's match
+    assert set(fallback_extractor.extract_symbols('BUY TCS INFY RELIANCE')) == {'TCS', 'INFY', 'RELIANCE'}
+    assert set(fallback_extractor.extract_symbols('TCSEQ INFYEQ')) == {'TCS', 'INFY'}
+
+@pytest.mark.parametrize('text', TEXTS + ['BUY TCS INFY RELIANCE', 'TCSEQ INFYEQ'])
+def test_fallback_matches_automaton(automaton_extractor, fallback_extractor, text):
+    assert set(fallback_extractor.extract_symbols(text)) == set(automaton_extractor.extract_symbols(text))
+
+@pytest.mark.parametrize('text, expected', [
+    ('BUY TCSEQ', [('TCS', 0.1)]),
+    ('$TCS TCSEQ', [('TCS', 0.4)]),
+    ('go TCSBSE buy', [('TCS', 0.1)]),
+    ('X TCSNSE y', [('TCS', 0.0)]),
+    ('NSE:INFY target', [('INFY', 0.5)]),
+])
+def test_confidence_rules(fallback_extractor, text, expected):
+    assert list(fallback_extractor.analyze_symbols(text)) == expected
+
+@pytest.mark.parametrize('text', TEXTS + ['BUY TCS INFY RELIANCE', 'TCS $TCSX stop'])
+def test_confidence_matches_baseline(fallback_extractor, text):
+    cleaned = fallback_extractor._clean_text(text)
+    for symbol, confidence in fallback_extractor.analyze_symbols(text):
+        assert confidence == baseline_confidence(symbol, cleaned)
+
+def test_batch_shares_the_single_text_cache(fallback_extractor):
+    single = fallback_extractor.analyze_symbols('$TCS buy')
+    assert isinstance(single, tuple)
+    batch = fallback_extractor.analyze_symbols_batch(['$TCS buy', 'NSE:INFY', '$TCS buy'])
+    assert batch[0] is single and batch[2] is single
+    assert fallback_extractor.analyze_symbols('NSE:INFY') is batch[1]
+
+def test_cache_evicts_least_recently_used(fallback_extractor, monkeypatch):
+    monkeypatch.setattr(symbol_extractor, 'ANALYZE_CACHE_SIZE', 2)
+    first = fallback_extractor.analyze_symbols('$TCS buy')
+    fallback_extractor.analyze_symbols('NSE:INFY')
+    # A hit refreshes '$TCS buy', so the next insert evicts 'NSE:INFY' instead
+    assert fallback_extractor.analyze_symbols_batch(['$TCS buy'])[0] is first
+    fallback_extractor.analyze_symbols('$SBIN sell')
+    assert fallback_extractor.analyze_symbols('$TCS buy') is first
+    assert 'NSE:INFY' not in fallback_extractor._scores
+
+def test_extractors_are_not_kept_alive_by_the_cache(tmp_path):
+    extractor = SymbolExtractor(StubHistoricalData(str(tmp_path)))
+    extractor.analyze_symbols('$TCS buy')
+    ref = weakref.ref(extractor)
+    del extractor
+    gc.collect()
+    assert ref() is None
+
+def test_nse_symbols_cache_is_reused(tmp_path):
+    if symbol_extractor.marisa_trie is None:
+        pytest.skip('marisa-trie not installed')
+    SymbolExtractor(StubHistoricalData(str(tmp_path)))
+    # Only the finished trie is left behind, no temp files
+    assert sorted(p.name for p in tmp_path.iterdir()) == [symbol_extractor.NSE_SYMBOLS_FILE]
+
+    class NoFetch(StubHistoricalData):
+        def get_instruments(self, exchange):
+            raise AssertionError('symbols should come from the cached trie')
+
+    assert SymbolExtractor(NoFetch(str(tmp_path)))._nse_symbols == frozenset(NSE_SYMBOLS)